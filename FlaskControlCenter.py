@@ -16,6 +16,12 @@ load_dotenv(BASE_DIR / "envs" / "Discord.env")
 load_dotenv(BASE_DIR / "envs" / "Discord_Text.env")
 load_dotenv(BASE_DIR / "envs" / "app.env")
 
+# ==================================================
+# Import profiler (before the heavy imports; /debug/imports)
+# ==================================================
+from scripts import import_profiler
+import_profiler.install()
+
 # ==================================================
 # FORCE SDK govee import
 # ==================================================
@@ -31,16 +37,27 @@ for p in site.getsitepackages():
 # ==================================================
 import flask
 import time
+import signal
 import threading
 from scripts import discord_service
 
-from govee.client import GoveeClient
-from govee.models import Device
-from govee import Colors
-
 
 from scripts import bambu_api
+from scripts import event_hub
+from scripts import steam_api
+from scripts import govee_lan
 from scripts.bambu_camera_mjpeg import BambuMJPEGCamera
+from scripts.bambu_timelapse import TimelapseRecorder
+from scripts.bambu_timelapse_video import TimelapseAssembler
+from scripts.bambu_telemetry import TelemetryRecorder
+from scripts.pc_bridge import PCBridge
+from scripts.pc_health import PCHealthMonitor
+from scripts.system_stats import SystemStatsSampler, SERIES as SYSTEM_SERIES
+from scripts.timeseries import TimeSeriesStore
+from scripts.hexa_state import HexaState
+from scripts.govee_worker import GoveeWorker
+from scripts.govee.scene_sync import SceneSync
+from scripts.startup import Startup
 
 # ==================================================
 # Blueprints
@@ -54,6 +71,7 @@ from routes.hexa_glide import hexa_bp
 from routes.uploads import uploads_bp, upload_bp
 from routes.weather import weather_bp
 from routes.discord import discord_bp
+from routes.events import events_bp
 
 # ==================================================
 # Flask setup
@@ -104,12 +122,27 @@ def get_start_time():
         time.localtime(APP_START_TIME)
     )
 
+# ==================================================
+# Startup orchestrator
+# ==================================================
+# Core steps run inline below; network-bound integrations are spawned
+# so they come up concurrently while the UI is already being served.
+# Per-step state and timings: /health/ready
+startup = Startup()
+flask_client.config["STARTUP"] = startup
+
 # ==================================================
 # Runtime state (Lights)
 # ==================================================
-current_BRIGHTNESS = 100
-current_POWER = False
-current_COLOR = {"r": 255, "g": 255, "b": 255}
+# Loaded once; routes mutate it in memory and a write-behind
+# flusher persists it to data/hexa_state.json
+HEXA_STATE_PATH = BASE_DIR / "data" / "hexa_state.json"
+hexa_state_saved = HEXA_STATE_PATH.exists()
+
+with startup.step("hexa_state"):
+    hexa_state = HexaState(HEXA_STATE_PATH)
+    hexa_state.load()
+    hexa_state.start()
 
 # ==================================================
 # Bambu (Printer) setup
@@ -117,19 +150,66 @@ current_COLOR = {"r": 255, "g": 255, "b": 255}
 BAMBU_DEVICE_NAME = os.getenv("BAMBU_DEVICE_NAME", "P1S")
 BAMBU_P1S_LAN_ID = os.getenv("BAMBU_P1S_LAN_ID")
 BAMBU_P1S_ACCESS_CODE = os.getenv("BAMBU_P1S_ACCESS_CODE")
+P1S_TIMELAPSE = os.getenv("P1S_TIMELAPSE", "false").lower() in ("1", "true", "yes")
+
+# Per-job temperature / progress / layer / fan history (/api/p1s/history)
+with startup.step("p1s_telemetry"):
+    p1s_telemetry = TelemetryRecorder(BASE_DIR / "data" / "p1s_history")
+    bambu_api.add_listener(p1s_telemetry.observe)
+    p1s_telemetry.start()
+
+flask_client.config["P1S_TELEMETRY"] = p1s_telemetry
 
 if not BAMBU_P1S_LAN_ID or not BAMBU_P1S_ACCESS_CODE:
     print("Bambu credentials missing — printer features disabled", flush=True)
     bambu_camera = None
+    p1s_timelapse = None
+    p1s_timelapse_video = None
+    startup.skip("bambu", "credentials missing")
 else:
     bambu_camera = BambuMJPEGCamera(
         BAMBU_P1S_LAN_ID,
         BAMBU_P1S_ACCESS_CODE
     )
-    bambu_api.start_bambu()
-    bambu_camera.start()
+    # Auth + MQTT connect in the background; endpoints report "Connecting"
+    startup.spawn(
+        "bambu",
+        bambu_api.start_bambu,
+        ready=lambda: bambu_api.get_readiness()["state"] == "ready",
+        timeout=60,
+    )
+    startup.spawn(
+        "camera",
+        bambu_camera.start,
+        ready=lambda: bambu_camera.get_frame() is not None,
+        timeout=60,
+    )
+
+    # One camera frame per layer change (P1S_TIMELAPSE=true),
+    # assembled into a video when the job ends
+    if P1S_TIMELAPSE:
+        p1s_timelapse_video = TimelapseAssembler(
+            BASE_DIR / "data" / "timelapse",
+            BASE_DIR / "data" / "timelapse_video",
+        )
+        p1s_timelapse_video.start()
+
+        p1s_timelapse = TimelapseRecorder(
+            bambu_camera,
+            BASE_DIR / "data" / "timelapse",
+            job_key=p1s_telemetry.current_job,
+            on_job_end=p1s_timelapse_video.request,
+        )
+        bambu_api.add_listener(p1s_timelapse.observe)
+        p1s_timelapse.start()
+    else:
+        p1s_timelapse = None
+        p1s_timelapse_video = None
+        startup.skip("p1s_timelapse", "P1S_TIMELAPSE not enabled")
 
 flask_client.config["BAMBU_CAMERA"] = bambu_camera
+flask_client.config["P1S_TIMELAPSE"] = p1s_timelapse
+flask_client.config["P1S_TIMELAPSE_VIDEO"] = p1s_timelapse_video
 
 # ==================================================
 # Network (PC bridge)
@@ -138,6 +218,38 @@ flask_client.config["PC_IP"] = os.getenv("PC_IP")
 flask_client.config["PC_PORT"] = os.getenv("PC_PORT")
 flask_client.config["SECRET_TOKEN"] = os.getenv("SECRET_TOKEN")
 
+with startup.step("pc_bridge"):
+    pc_bridge = PCBridge(
+        flask_client.config["PC_IP"],
+        flask_client.config["PC_PORT"],
+        flask_client.config["SECRET_TOKEN"],
+    )
+
+    pc_health_monitor = PCHealthMonitor(pc_bridge)
+    pc_health_monitor.start()
+
+flask_client.config["PC_BRIDGE"] = pc_bridge
+flask_client.config["PC_HEALTH"] = pc_health_monitor
+
+# ==================================================
+# System stats sampler
+# ==================================================
+with startup.step("system_stats"):
+    system_stats = SystemStatsSampler()
+
+    # 1s / 1m / 1h rollups for the trend endpoints
+    system_trends = TimeSeriesStore(
+        SYSTEM_SERIES,
+        path=BASE_DIR / "data" / "system_timeseries.json",
+    )
+    system_stats.add_listener(system_trends.add)
+
+    system_trends.start()
+    system_stats.start()
+
+flask_client.config["SYSTEM_STATS"] = system_stats
+flask_client.config["SYSTEM_TRENDS"] = system_trends
+
 # ==================================================
 # Govee (Lights)
 # ==================================================
@@ -149,8 +261,38 @@ govee_device_sku = os.getenv("GOVEE_DEVICE_SKU")
 if not all([govee_api_key, govee_device_lan_id, govee_device_name, govee_device_sku]):
     print("Govee credentials missing — Hexa Glide disabled", flush=True)
     govee_client = None
+    govee_worker = None
+    govee_scene_sync = None
     hexagon_lights = None
+    startup.skip("govee", "credentials missing")
 else:
+    # SDK client + Device are built by sync_govee_power() in the
+    # background (importing the govee SDK alone is slow on the Pi)
+    govee_client = None
+    hexagon_lights = None
+
+    with startup.step("govee"):
+        # Cached LAN devStatus for /api/hexa/status
+        govee_lan.status_listener.start()
+
+        # One event loop + client for async SDK calls (scene apply)
+        govee_worker = GoveeWorker(govee_api_key, prefer_lan=True)
+
+        # In-process scene catalog refresh (POST /api/hexa/scenes/refresh)
+        govee_scene_sync = SceneSync(govee_api_key)
+
+    startup.spawn("govee_worker", govee_worker.start)
+
+# ==================================================
+# Sync initial Govee power state (IMPORTANT)
+# ==================================================
+
+def sync_govee_power():
+    global govee_client, hexagon_lights
+
+    from govee.client import GoveeClient
+    from govee.models import Device
+
     govee_client = GoveeClient(api_key=govee_api_key)
     hexagon_lights = Device(
         id=None,
@@ -158,14 +300,12 @@ else:
         name=govee_device_name,
         sku=govee_device_sku,
     )
-# ==================================================
-# Sync initial Govee power state (IMPORTANT)
-# ==================================================
+    flask_client.config["GOVEE_CLIENT"] = govee_client
+    flask_client.config["HEXAGON_LIGHTS"] = hexagon_lights
 
-current_POWER = False  # default fallback
+    current_POWER = False  # default fallback
 
-try:
-    if govee_client is not None and hexagon_lights is not None:
+    try:
         state = govee_client.get_device_state(hexagon_lights) or {}
 
         # Govee may return: {"power": "on"}, {"power": "off"}, {"on": True}, etc.
@@ -182,20 +322,39 @@ try:
             f"Hexa Glide initial power sync → raw={power_raw!r}, parsed={current_POWER}",
             flush=True
         )
-    else:
-        print("Govee client or device missing — assuming power OFF", flush=True)
 
-except Exception as e:
-    print("Failed to sync Hexa Glide power state:", e, flush=True)
-    current_POWER = False
+    except Exception as e:
+        print("Failed to sync Hexa Glide power state:", e, flush=True)
+        current_POWER = False
 
+    # The saved state wins (it did before too); the cloud sync only
+    # seeds power on a fresh install
+    if not hexa_state_saved:
+        hexa_state["CURRENT_POWER"] = current_POWER
 
-# Store synced state in Flask config
+# Store synced state in Flask config (client / device are filled in
+# by sync_govee_power once the SDK is loaded)
 flask_client.config["GOVEE_CLIENT"] = govee_client
+flask_client.config["GOVEE_WORKER"] = govee_worker
+flask_client.config["GOVEE_SCENE_SYNC"] = govee_scene_sync
 flask_client.config["HEXAGON_LIGHTS"] = hexagon_lights
-flask_client.config["CURRENT_BRIGHTNESS"] = current_BRIGHTNESS
-flask_client.config["CURRENT_POWER"] = current_POWER
-flask_client.config["CURRENT_COLOR"] = current_COLOR
+flask_client.config["HEXA_STATE"] = hexa_state
+
+if govee_worker is not None:
+    # SDK import + cloud round trip: runs alongside the rest of startup
+    startup.spawn("govee_power", sync_govee_power)
+else:
+    print("Govee client or device missing — assuming power OFF", flush=True)
+
+# ==================================================
+# Steam
+# ==================================================
+if steam_api.is_configured():
+    # WebAPI() fetches the interface list; warm it in the background
+    startup.spawn("steam", steam_api.get_api)
+else:
+    print("Steam keys missing — Steam features disabled", flush=True)
+    startup.skip("steam", "credentials missing")
 
 # ==================================================
 # Register Blueprints
@@ -209,6 +368,22 @@ flask_client.register_blueprint(uploads_bp)
 flask_client.register_blueprint(upload_bp)
 flask_client.register_blueprint(weather_bp)
 flask_client.register_blueprint(discord_bp)
+flask_client.register_blueprint(events_bp)
+
+# ==================================================
+# Event hub sources (pushed to /api/events)
+# ==================================================
+from routes.hexa_glide import get_hexa_status
+from scripts.bambu_helper import get_p1s_status
+from scripts.steam_api import get_friends_status
+
+event_hub.register_source("lights", lambda: get_hexa_status(hexa_state), interval=2)
+event_hub.register_source("printer", get_p1s_status, interval=2)
+event_hub.register_source("discord_voice", discord_service.get_voice_snapshot, interval=2)
+event_hub.register_source("discord_text", discord_service.get_text_heads, interval=2)
+if steam_api.is_configured():
+    event_hub.register_source("steam_friends", get_friends_status, interval=10)
+# pc_health is pushed by PCHealthMonitor on online/offline transitions
 
 # ==================================================
 # Core Routes
@@ -221,6 +396,23 @@ def index():
 def health():
     return "OK", 200
 
+@flask_client.route("/health/ready")
+def health_ready():
+    # 200 once every subsystem is up; 503 (with per-step detail) until then
+    status = startup.get_status()
+    ok = status["complete"] and not status["failed"]
+    return status, 200 if ok else 503
+
+@flask_client.route("/debug/imports")
+def debug_imports():
+    # Per-module import cost since startup (?limit=50&sort=self&prefix=scripts)
+    args = flask.request.args
+    return import_profiler.get_report(
+        limit=args.get("limit", 50, type=int),
+        prefix=args.get("prefix"),
+        sort=args.get("sort", "cumulative"),
+    )
+
 @flask_client.route("/version")
 def version():
     uptime = get_uptime()
@@ -261,6 +453,12 @@ def start_discord_service():
     except Exception as e:
         print("Discord service failed to start:", e, flush=True)
 
+def launch_discord_service():
+    threading.Thread(
+        target=start_discord_service,
+        daemon=True
+    ).start()
+
 
 
 # ==================================================
@@ -269,10 +467,21 @@ def start_discord_service():
 
 if __name__ == "__main__":
 
-    threading.Thread(
-        target=start_discord_service,
-        daemon=True
-    ).start()
+    # systemd stops us with SIGTERM; turn it into a normal exit so
+    # atexit flushes (Hexa state, system trends) still run
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    # Logs in alongside the other integrations; ready after on_ready
+    if os.getenv("DISCORD_BOT_TOKEN"):
+        startup.spawn(
+            "discord",
+            launch_discord_service,
+            ready=lambda: discord_service.discord_ready,
+            timeout=120,
+        )
+    else:
+        print("Discord token missing — Discord features disabled", flush=True)
+        startup.skip("discord", "credentials missing")
 
     flask_client.run(
         host="0.0.0.0",
@@ -1,9 +1,9 @@
 import os
 import flask
-import requests
 
 from flask import Blueprint, current_app
 from scripts import discord_service
+from scripts.pc_bridge import PCBridge
 
 discord_bp = Blueprint("discord", __name__)
 
@@ -35,22 +35,18 @@ def discord_join():
     if not channel_name:
         return {"success": False, "error": "missing channel_name"}, 400
 
-    pc_ip = current_app.config.get("PC_IP")
-    pc_port = current_app.config.get("PC_PORT")
-    secret = current_app.config.get("SECRET_TOKEN")
+    bridge: PCBridge = current_app.config["PC_BRIDGE"]
 
-    if not pc_ip or not pc_port:
+    if not bridge.configured:
         return {"success": False, "error": "PC not configured"}, 500
 
     try:
-        res = requests.post(
-            f"http://{pc_ip}:{pc_port}/discord/join",
+        res = bridge.post(
+            "discord/join",
             json={
                 "channel_name": channel_name,
                 "member_count": member_count,
-                "token": secret
             },
-            timeout=3
         )
 
         if not res.ok:
@@ -64,19 +60,13 @@ def discord_join():
 
 @discord_bp.route("/api/discord/leave", methods=["POST"])
 def discord_leave():
-    pc_ip = current_app.config.get("PC_IP")
-    pc_port = current_app.config.get("PC_PORT")
-    secret = current_app.config.get("SECRET_TOKEN")
+    bridge: PCBridge = current_app.config["PC_BRIDGE"]
 
-    if not pc_ip or not pc_port:
+    if not bridge.configured:
         return {"success": False, "error": "PC not configured"}, 500
 
     try:
-        res = requests.post(
-            f"http://{pc_ip}:{pc_port}/discord/leave",
-            json={"token": secret},
-            timeout=3
-        )
+        res = bridge.post("discord/leave")
 
         if not res.ok:
             return {"success": False, "error": "PC rejected request"}, 502
@@ -118,21 +108,15 @@ def discord_text_open():
     if not channel_name:
         return {"success": False, "error": "missing channel_name"}, 400
 
-    pc_ip = current_app.config.get("PC_IP")
-    pc_port = current_app.config.get("PC_PORT")
-    secret = current_app.config.get("SECRET_TOKEN")
+    bridge: PCBridge = current_app.config["PC_BRIDGE"]
 
-    if not pc_ip or not pc_port:
+    if not bridge.configured:
         return {"success": False, "error": "PC not configured"}, 500
 
     try:
-        res = requests.post(
-            f"http://{pc_ip}:{pc_port}/discord/text/open",
-            json={
-                "channel_name": channel_name,
-                "token": secret
-            },
-            timeout=3
+        res = bridge.post(
+            "discord/text/open",
+            json={"channel_name": channel_name},
         )
 
         if not res.ok:
@@ -146,16 +130,10 @@ def discord_text_open():
 
 @discord_bp.route("/api/discord/screen_share", methods=["POST"])
 def discord_screen_share():
-    pc_ip = current_app.config.get("PC_IP")
-    pc_port = current_app.config.get("PC_PORT")
-    secret = current_app.config.get("SECRET_TOKEN")
+    bridge: PCBridge = current_app.config["PC_BRIDGE"]
 
     try:
-        res = requests.post(
-            f"http://{pc_ip}:{pc_port}/discord/screen_share",
-            json={"token": secret},
-            timeout=3
-        )
+        res = bridge.post("discord/screen_share")
 
         if not res.ok:
             return {"success": False}, 502
@@ -174,18 +152,12 @@ def discord_voice_action():
     if action not in ("mute", "deafen"):
         return {"success": False, "error": "Invalid action"}, 400
 
-    pc_ip = current_app.config.get("PC_IP")
-    pc_port = current_app.config.get("PC_PORT")
-    secret = current_app.config.get("SECRET_TOKEN")
+    bridge: PCBridge = current_app.config["PC_BRIDGE"]
 
     try:
-        res = requests.post(
-            f"http://{pc_ip}:{pc_port}/discord/voice_action",
-            json={
-                "action": action,
-                "token": secret
-            },
-            timeout=3
+        res = bridge.post(
+            "discord/voice_action",
+            json={"action": action},
         )
 
         if not res.ok:
@@ -0,0 +1,29 @@
+import flask
+
+from scripts import event_hub
+
+events_bp = flask.Blueprint("events", __name__)
+
+
+# ==================================================
+# Server-Sent Events (push instead of per-page polling)
+# ==================================================
+@events_bp.route("/api/events")
+def api_events():
+    last_id = (
+        flask.request.headers.get("Last-Event-ID")
+        or flask.request.args.get("since")
+    )
+
+    resp = flask.Response(
+        event_hub.stream(last_id),
+        mimetype="text/event-stream",
+    )
+    resp.headers["Cache-Control"] = "no-store"
+    resp.headers["X-Accel-Buffering"] = "no"
+    return resp
+
+
+@events_bp.route("/api/events/stats")
+def api_events_stats():
+    return flask.jsonify(event_hub.get_stats())
@@ -1,20 +1,12 @@
 import flask
 import json
-import asyncio
-import os
 from pathlib import Path
-import sys
-import subprocess
-import pexpect
-import threading
-import importlib
-import time
-
-from govee import Device, GoveeClient
-from scripts.govee import govee_diy_scenes
-from scripts.govee import govee_diy_scene_aliases
-from scripts.govee.govee_devices import H6061_7122D005C1061F48
-from scripts.govee import govee_scenes
+
+from scripts.govee.scene_catalog import (
+    catalog as scene_catalog,
+    to_sdk_scene,
+    to_sdk_device,
+)
 
 # Source for manual LAN controls
 from scripts.govee_hexa import (
@@ -24,73 +16,20 @@ from scripts.govee_hexa import (
 )
 
 hexa_bp = flask.Blueprint("hexa", __name__)
-GOVEE_BRIGHTNESS_LOCK = threading.Lock()
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # ==================================================
 # Global Variables
 # ==================================================
-GOVEE_REFRESH_LOCK = threading.Lock()
+APPLY_TIMEOUT = 12.0    # seconds to wait for a scene apply
 
 # ==================================================
 # Paths
 # ==================================================
-STATE_DATA_PATH = BASE_DIR / "data" / "hexa_state.json"
 SCENE_DATA_PATH = BASE_DIR / "data" / "hexa_scenes.json"
 
 # ==================================================
-# Environment
-# ==================================================
-GOVEE_API_KEY = os.getenv("GOVEE_API_KEY")
-if not GOVEE_API_KEY:
-    raise RuntimeError("GOVEE_API_KEY not found")
-
-# ==================================================
-# helper function (govee-sync refresh)
-# ==================================================
-def run_govee_refresh(log_path: Path, scripts_dir: Path, fixer_path: Path):
-    try:
-        with log_path.open("w") as log:
-            def log_write(msg):
-                log.write(msg + "\n")
-                log.flush()
-
-            log_write("=== DIY scene refresh started ===")
-
-            # 1️⃣ Run your refresh script
-            result = subprocess.run(
-                [sys.executable, "refresh_diy_scenes.py"],
-                cwd=str(scripts_dir),
-                capture_output=True,
-                text=True,
-            )
-
-            log_write("=== refresh_diy_scenes.py stdout ===")
-            log_write(result.stdout)
-            log_write("=== refresh_diy_scenes.py stderr ===")
-            log_write(result.stderr)
-
-            # 2️⃣ Run fixer
-            if fixer_path.exists():
-                fix = subprocess.run(
-                    [sys.executable, str(fixer_path)],
-                    cwd=str(fixer_path.parent),
-                    capture_output=True,
-                    text=True,
-                )
-                log_write("=== fixer stdout ===")
-                log_write(fix.stdout)
-                log_write("=== fixer stderr ===")
-                log_write(fix.stderr)
-
-            log_write("=== refresh completed ===")
-
-    finally:
-        if GOVEE_REFRESH_LOCK.locked():
-            GOVEE_REFRESH_LOCK.release()
-
-# ==================================================
-# Helpers (state persistence)
+# Helpers (state)
 # ==================================================
 def _atomic_write(path: Path, payload: dict):
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -98,48 +37,9 @@ def _atomic_write(path: Path, payload: dict):
     tmp.write_text(json.dumps(payload, indent=2))
     tmp.replace(path)
 
-def _ensure_defaults(cfg):
-    cfg.setdefault("CURRENT_POWER", False)
-    cfg.setdefault("CURRENT_BRIGHTNESS", 100)
-    cfg.setdefault("CURRENT_COLOR", {"r": 255, "g": 255, "b": 255})
-    cfg.setdefault("CURRENT_MODE", "color")
-    cfg.setdefault("CURRENT_SCENE", None)
-
-def load_state():
-    if STATE_DATA_PATH.exists():
-        try:
-            data = json.loads(STATE_DATA_PATH.read_text())
-            return data if isinstance(data, dict) else {}
-        except Exception:
-            return {}
-    return {}
-
-def save_state(cfg):
-    _ensure_defaults(cfg)
-    _atomic_write(
-        STATE_DATA_PATH,
-        {
-            "power": bool(cfg["CURRENT_POWER"]),
-            "brightness": int(cfg["CURRENT_BRIGHTNESS"]),
-            "color": cfg["CURRENT_COLOR"],
-            "kelvin": int(cfg.get("CURRENT_KELVIN", 6500)),
-            "mode": cfg["CURRENT_MODE"],
-            "active_scene": cfg["CURRENT_SCENE"],
-        },
-    )
-
-def restore_state(cfg):
-    _ensure_defaults(cfg)
-    data = load_state()
-    if not data:
-        return
-
-    cfg["CURRENT_POWER"] = bool(data.get("power", cfg["CURRENT_POWER"]))
-    cfg["CURRENT_BRIGHTNESS"] = int(data.get("brightness", cfg["CURRENT_BRIGHTNESS"]))
-    cfg["CURRENT_COLOR"] = data.get("color", cfg["CURRENT_COLOR"]) or cfg["CURRENT_COLOR"]
-    cfg["CURRENT_MODE"] = data.get("mode", cfg["CURRENT_MODE"]) or "color"
-    cfg["CURRENT_SCENE"] = data.get("active_scene", None)
-    cfg["CURRENT_KELVIN"] = int(data.get("kelvin", cfg.get("CURRENT_KELVIN", 6500)))
+def _state():
+    # In-memory HexaState (scripts/hexa_state.py); persisted write-behind
+    return flask.current_app.config["HEXA_STATE"]
 
 
 # ==================================================
@@ -159,98 +59,42 @@ def load_scene_slots():
         "slot_3": {"key": None, "name": "Slot 3"},
     }
 
-# ==================================================
-# Scenes: alias lookup (default load)
-# ==================================================
-def build_alias_lookup(module_aliases):
-    lookup = {}
-    # Support both older and newer generated formats
-    for name in dir(module_aliases):
-        if not name.startswith("H6061_"):
-            continue
-        alias = getattr(module_aliases, name)
-        # Common possibilities: (scene_id,name) OR (id,name)
-        if hasattr(alias, "scene_id") and hasattr(alias, "name"):
-            lookup[getattr(alias, "scene_id")] = alias
-        elif hasattr(alias, "id") and hasattr(alias, "name"):
-            lookup[getattr(alias, "id")] = alias
-    return lookup
-
 # ==================================================
 # Pages
 # ==================================================
 @hexa_bp.route("/Hexa_Glide")
 def hexa_glide():
-    cfg = flask.current_app.config
-    device: Device = cfg.get("HEXAGON_LIGHTS")
-
-    restore_state(cfg)
-    save_state(cfg)
+    # govee.Device, or None when Govee is not configured
+    device = flask.current_app.config.get("HEXAGON_LIGHTS")
+    state = _state()
 
     return flask.render_template(
         "hexa_glide/hexa_glide.html",
         device_name=device.name if device else "Hexa Glide",
-        power_state="on" if cfg["CURRENT_POWER"] else "off",
-        brightness=cfg["CURRENT_BRIGHTNESS"],
-        current_color=cfg["CURRENT_COLOR"],
-        mode=cfg["CURRENT_MODE"],
-        active_scene=cfg["CURRENT_SCENE"],
+        power_state="on" if state["CURRENT_POWER"] else "off",
+        brightness=state["CURRENT_BRIGHTNESS"],
+        current_color=state["CURRENT_COLOR"],
+        mode=state["CURRENT_MODE"],
+        active_scene=state["CURRENT_SCENE"],
     )
 
 @hexa_bp.route("/Hexa_Glide/Scenes")
 def hexa_glide_scenes():
-    cfg = flask.current_app.config
-    restore_state(cfg)
+    state = _state()
 
     # -------------------------------------------------
-    # Reload scene modules (no Flask restart)
+    # Cached catalog (rebuilt only when a sync changes it)
     # -------------------------------------------------
-    import scripts.govee.govee_diy_scenes as diy_mod
-    import scripts.govee.govee_diy_scene_aliases as aliases_mod
-    import scripts.govee.govee_scenes as govee_mod
-
-    importlib.reload(diy_mod)
-    importlib.reload(aliases_mod)
-    importlib.reload(govee_mod)
-
-    alias_lookup = build_alias_lookup(aliases_mod)
+    index = scene_catalog.index()
     scene_slots = load_scene_slots()
 
-    # -------------------------------------------------
     # USER (DIY) SCENES — ALL of them
-    # -------------------------------------------------
-    user_scenes: list[dict] = []
+    user_scenes = index["user_scenes"]
 
-    for name in getattr(diy_mod, "__all__", []):
-        scene = getattr(diy_mod, name, None)
-        if not scene:
-            continue
-
-        alias = alias_lookup.get(getattr(scene, "id", None))
-
-        user_scenes.append({
-            "key": name,
-            "name": alias.name if alias else scene.name,
-        })
-
-    # -------------------------------------------------
     # BUILT-IN GOVEE SCENES
-    # -------------------------------------------------
-    govee_scenes: list[dict] = []
-
-    for name in getattr(govee_mod, "__all__", []):
-        scene = getattr(govee_mod, name, None)
-        if not scene:
-            continue
+    govee_scenes = index["govee_scenes"]
 
-        govee_scenes.append({
-            "key": name,
-            "name": scene.name,
-        })
-
-    # -------------------------------------------------
     # Combined list (for random button)
-    # -------------------------------------------------
     all_scenes = user_scenes
 
     # -------------------------------------------------
@@ -258,12 +102,12 @@ def hexa_glide_scenes():
     # -------------------------------------------------
     return flask.render_template(
         "hexa_glide/hexa_glide_scenes.html",
-        power_state="on" if cfg["CURRENT_POWER"] else "off",
+        power_state="on" if state["CURRENT_POWER"] else "off",
         scene_slots=scene_slots,
         govee_scenes=govee_scenes,
         user_scenes=user_scenes,
         all_scenes=all_scenes,
-        active_scene=cfg.get("CURRENT_SCENE"),
+        active_scene=state.get("CURRENT_SCENE"),
     )
 
 
@@ -272,22 +116,20 @@ def hexa_glide_scenes():
 # ==================================================
 @hexa_bp.route("/api/power", methods=["POST"])
 def api_power():
-    cfg = flask.current_app.config
-    restore_state(cfg)
+    state = _state()
 
-    new_state = not bool(cfg["CURRENT_POWER"])
+    new_state = not bool(state["CURRENT_POWER"])
     try:
-        hexa_set_power(cfg, new_state)
+        hexa_set_power(state, new_state)
     except Exception as e:
         print("LAN power failed:", e, flush=True)
         return {"success": False, "error": str(e)}, 500
 
-    save_state(cfg)
     return {
         "success": True,
-        "power": "on" if cfg["CURRENT_POWER"] else "off",
-        "mode": cfg["CURRENT_MODE"],
-        "active_scene": cfg["CURRENT_SCENE"],
+        "power": "on" if state["CURRENT_POWER"] else "off",
+        "mode": state["CURRENT_MODE"],
+        "active_scene": state["CURRENT_SCENE"],
     }
 
 # ==================================================
@@ -295,11 +137,9 @@ def api_power():
 # ==================================================
 @hexa_bp.route("/api/brightness", methods=["POST"])
 def api_brightness():
-    if not GOVEE_BRIGHTNESS_LOCK.acquire(blocking=False):
-        return {"success": False, "error": "busy"}, 429
-
+    # No lock: the LAN sender coalesces rapid updates (latest value wins)
     try:
-        cfg = flask.current_app.config
+        state = _state()
         payload = flask.request.get_json(silent=True) or {}
 
         raw = payload.get("brightness")
@@ -312,39 +152,33 @@ def api_brightness():
         except (TypeError, ValueError):
             return {"success": False, "error": "invalid brightness"}, 400
 
-        #DO NOT restore_state here
-        prev_mode = cfg["CURRENT_MODE"]
-        prev_scene = cfg["CURRENT_SCENE"]
+        prev_mode = state["CURRENT_MODE"]
+        prev_scene = state["CURRENT_SCENE"]
 
-        hexa_set_brightness(cfg, value)
+        hexa_set_brightness(state, value)
 
         # preserve mode
-        cfg["CURRENT_MODE"] = prev_mode
-        cfg["CURRENT_SCENE"] = prev_scene
-
-        save_state(cfg)
+        state["CURRENT_MODE"] = prev_mode
+        state["CURRENT_SCENE"] = prev_scene
 
         return {
             "success": True,
             "brightness": value,
-            "mode": cfg["CURRENT_MODE"],
-            "active_scene": cfg["CURRENT_SCENE"],
+            "mode": state["CURRENT_MODE"],
+            "active_scene": state["CURRENT_SCENE"],
         }
 
     except Exception as e:
         print("brightness crash:", e, flush=True)
         return {"success": False}, 500
 
-    finally:
-        GOVEE_BRIGHTNESS_LOCK.release()
-
 # ==================================================
 # API — Color (LAN via scripts/govee_hexa.py)
 # ==================================================
 
 @hexa_bp.route("/api/color", methods=["POST"])
 def api_color():
-    cfg = flask.current_app.config
+    state = _state()
     payload = flask.request.get_json(silent=True) or {}
 
     try:
@@ -355,23 +189,21 @@ def api_color():
     except Exception:
         return {"success": False, "error": "invalid color"}, 400
 
-    cfg["CURRENT_POWER"] = True
-    cfg["CURRENT_MODE"] = "color"
-    cfg["CURRENT_SCENE"] = None
+    state["CURRENT_POWER"] = True
+    state["CURRENT_MODE"] = "color"
+    state["CURRENT_SCENE"] = None
 
     try:
-        hexa_set_color(cfg, r, g, b)
+        hexa_set_color(state, r, g, b)
     except Exception as e:
         print("LAN color failed:", e, flush=True)
         return {"success": False, "error": str(e)}, 500
-    
-    save_state(cfg)
 
     return {
         "success": True,
         "power": "on",
-        "color": cfg["CURRENT_COLOR"],
-        "mode": cfg["CURRENT_MODE"],
+        "color": state["CURRENT_COLOR"],
+        "mode": state["CURRENT_MODE"],
         "active_scene": None,
     }
 
@@ -380,7 +212,7 @@ def api_color():
 # ==================================================
 @hexa_bp.route("/api/kelvin", methods=["POST"])
 def api_kelvin():
-    cfg = flask.current_app.config
+    state = _state()
     payload = flask.request.get_json(silent=True) or {}
 
     try:
@@ -389,8 +221,7 @@ def api_kelvin():
         return {"success": False}, 400
 
     from scripts.govee_hexa import set_kelvin
-    set_kelvin(cfg, kelvin)
-    save_state(cfg)
+    set_kelvin(state, kelvin)
 
     return {
         "success": True,
@@ -401,11 +232,11 @@ def api_kelvin():
 # ==================================================
 # API — STATUS (LAN truth + persisted intent)
 # ==================================================
-@hexa_bp.route("/api/hexa/status")
-def api_hexa_status():
-    persisted = load_state()
+def get_hexa_status(state=None):
+    # state is passed explicitly by callers outside a request (event hub)
+    persisted = (state if state is not None else _state()).snapshot()
 
-    # LAN status (usually empty for Hexa devices)
+    # LAN status from the background listener's cache (no network wait)
     live = {}
     try:
         from scripts.govee_lan import query_status, normalize_status
@@ -413,7 +244,7 @@ def api_hexa_status():
     except Exception:
         live = {}
 
-    # Cloud fallback (authoritative state)
+    # Cloud fallback (cached; refreshed in the background, never waited on)
     if not live:
         try:
             from scripts.govee_cloud_status import get_cloud_status
@@ -441,27 +272,54 @@ def api_hexa_status():
         "active_scene": persisted.get("active_scene"),
     }
 
+@hexa_bp.route("/api/hexa/status")
+def api_hexa_status():
+    return get_hexa_status()
+
+@hexa_bp.route("/api/hexa/lan/stats")
+def api_hexa_lan_stats():
+    from scripts.govee_lan import get_sender_stats, status_listener
+    worker = flask.current_app.config.get("GOVEE_WORKER")
+
+    try:
+        from scripts.govee_cloud_status import cache as cloud_cache
+        cloud = cloud_cache.get_stats()
+    except Exception:
+        cloud = None
+
+    return {
+        "sender": get_sender_stats(),
+        "status": status_listener.get_stats(),
+        "cloud": cloud,
+        "worker": worker.get_stats() if worker else None,
+    }
+
 # ==================================================
 # API — SCENE REFRESH (background govee-sync)
 # ==================================================
 @hexa_bp.route("/api/hexa/scenes/refresh", methods=["POST"])
 def refresh_scenes():
-    # Prevent overlap
-    if not GOVEE_REFRESH_LOCK.acquire(blocking=False):
+    sync = flask.current_app.config.get("GOVEE_SCENE_SYNC")
+    if sync is None:
+        return {"success": False, "error": "Govee not configured"}, 503
+
+    # In-process incremental sync (scripts/govee/scene_sync.py)
+    if not sync.start():
         return {"success": False, "error": "refresh already running"}, 409
 
-    log_path = BASE_DIR / "logs" / "govee_sync_refresh.log"
-    scripts_dir = BASE_DIR / "scripts" / "govee"
-    fixer_path = BASE_DIR / "scripts" / "govee_fix_aliases.py"
+    return {
+        "success": True,
+        "status_url": flask.url_for("hexa.refresh_scenes_status"),
+        "redirect": "/Hexa_Glide/Scenes",
+    }
 
-    t = threading.Thread(
-        target=run_govee_refresh,
-        args=(log_path, scripts_dir, fixer_path),
-        daemon=True,
-    )
-    t.start()
+@hexa_bp.route("/api/hexa/scenes/refresh/status")
+def refresh_scenes_status():
+    sync = flask.current_app.config.get("GOVEE_SCENE_SYNC")
+    if sync is None:
+        return {"success": False, "error": "Govee not configured"}, 503
 
-    return {"success": True, "redirect": "/Hexa_Glide/Scenes"}
+    return {"success": True, **sync.get_status()}
 
 # ==================================================
 # API — SCENE SLOT ASSIGN
@@ -491,73 +349,59 @@ def api_apply_scene():
         return {"success": False, "error": "missing scene_key"}, 400
 
     #DIY ONLY
-    scene = getattr(govee_diy_scenes, scene_key, None)
+    scene = scene_catalog.get_diy(scene_key)
     if not scene:
         return {"success": False, "error": "DIY scene not found"}, 404
 
-    async def run():
-        client = GoveeClient(
-            api_key=GOVEE_API_KEY,
-            prefer_lan=True,
-        )
-        await client.apply_scene(
-            H6061_7122D005C1061F48,
-            scene,
-        )
+    device = scene_catalog.get_device(scene.sku)
+    if not device:
+        return {"success": False, "error": "device not in catalog"}, 404
+
+    worker = flask.current_app.config.get("GOVEE_WORKER")
+    if worker is None:
+        return {"success": False, "error": "Govee not configured"}, 503
 
     try:
-        asyncio.run(run())
+        # Long-lived loop + client (scripts/govee_worker.py)
+        worker.apply_scene(
+            to_sdk_device(device),
+            to_sdk_scene(scene),
+            timeout=APPLY_TIMEOUT,
+        )
     except Exception as e:
         print("DIY apply_scene failed:", e, flush=True)
         return {"success": False, "error": str(e)}, 500
 
-    cfg = flask.current_app.config
-    restore_state(cfg)
+    state = _state()
 
-    cfg["CURRENT_POWER"] = True
-    cfg["CURRENT_MODE"] = "scene"
-    cfg["CURRENT_SCENE"] = {
+    state["CURRENT_POWER"] = True
+    state["CURRENT_MODE"] = "scene"
+    state["CURRENT_SCENE"] = {
         "key": scene_key,
         "name": scene.name,
     }
 
-    save_state(cfg)
-
     return {
         "success": True,
-        "active_scene": cfg["CURRENT_SCENE"],
+        "active_scene": state["CURRENT_SCENE"],
     }
 
 @hexa_bp.route("/api/hexa/scenes/user")
 def api_user_scenes():
-    import scripts.govee.govee_diy_scenes as diy_mod
-    import scripts.govee.govee_diy_scene_aliases as aliases_mod
-    importlib.reload(diy_mod)
-    importlib.reload(aliases_mod)
-
-    alias_lookup = build_alias_lookup(aliases_mod)
-
-    diy_ids_path = BASE_DIR / "scripts" / "govee" / "diy_scene_ids.json"
-    try:
-        diy_ids = set(json.loads(diy_ids_path.read_text()))
-    except Exception:
-        diy_ids = set()
-
-    user_scenes = []
+    index = scene_catalog.index()
 
-    for name in dir(diy_mod):
-        if not name.startswith("H6061_"):
-            continue
+    res = flask.jsonify({"success": True, "user_scenes": index["diy_scenes"]})
+    res.set_etag(index["etag"])
+    res.headers["Cache-Control"] = "no-cache"
+    # 304 when the client's If-None-Match still matches
+    return res.make_conditional(flask.request)
 
-        scene = getattr(diy_mod, name)
-        scene_id = getattr(scene, "id", None)
-        if scene_id not in diy_ids:
-            continue
 
-        alias = alias_lookup.get(scene_id)
-        user_scenes.append({
-            "key": name,
-            "name": alias.name if alias else scene.name,
-        })
+@hexa_bp.route("/api/hexa/scenes/catalog")
+def api_scene_catalog():
+    index = scene_catalog.index()
 
-    return {"success": True, "user_scenes": user_scenes}
+    res = flask.jsonify({"success": True, **index})
+    res.set_etag(index["etag"])
+    res.headers["Cache-Control"] = "no-cache"
+    return res.make_conditional(flask.request)
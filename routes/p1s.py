@@ -1,13 +1,13 @@
 import flask
-import json
+import hashlib
 from pathlib import Path
 from flask import current_app
-import requests
-from pathlib import Path
 
 
 from scripts.bambu_helper import get_p1s_status
-from scripts.bambu_camera_mjpeg import BambuMJPEGCamera
+from scripts.bambu_camera_mjpeg import BambuMJPEGCamera, PROFILES, DEFAULT_PROFILE
+from scripts.pc_bridge import PCBridge
+from scripts.pc_health import PCHealthMonitor
 
 print("LOADED routes/p1s.py")
 
@@ -45,35 +45,76 @@ def api_p1s_full():
     - profile name
     - layer numbers
     """
-    path = BASE_DIR / "data" / "p1s_full_state.json"
+    from scripts import bambu_api
 
-    if not path.exists():
-        return flask.jsonify({
-            "error": "p1s_full_state.json not found"
-        }), 404
+    # ?fields=subtask_name,layer_num,ams.tray_now  (optional projection)
+    fields = [f for f in flask.request.args.get("fields", "").split(",") if f]
+    suffix = "-" + hashlib.sha1(",".join(fields).encode()).hexdigest()[:8] if fields else ""
 
-    try:
-        data = json.loads(path.read_text())
-        resp = flask.jsonify(data)
-        resp.headers["Cache-Control"] = "no-store"
+    # Unchanged since the client's copy: answer before building anything
+    etag = bambu_api.get_state_version() + suffix
+    if flask.request.if_none_match.contains(etag):
+        resp = flask.Response(status=304)
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = "no-cache"
         return resp
-    except Exception as e:
+
+    # In-memory merged state; the file on disk is snapshot + journal
+    data = bambu_api.get_full_state(fields)
+
+    if not data["print"] and not fields:
         return flask.jsonify({
-            "error": "failed to read json",
-            "detail": str(e)
-        }), 500
+            "error": "no printer state yet"
+        }), 404
+
+    resp = flask.jsonify(data)
+    resp.set_etag(data["version"] + suffix)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+@p1s_bp.route("/api/p1s/history")
+def api_p1s_history():
+    """Recorded print jobs, newest first (metadata only)."""
+    recorder = flask.current_app.config["P1S_TELEMETRY"]
+    return flask.jsonify({
+        "current": recorder.current_job(),
+        "jobs": recorder.list_jobs(),
+    })
+
+@p1s_bp.route("/api/p1s/history/<job>")
+def api_p1s_history_job(job):
+    """
+    Time series for one job ("current" = the print in progress).
+    ?series=nozzle,bed limits the returned series.
+    """
+    recorder = flask.current_app.config["P1S_TELEMETRY"]
+
+    series = [s for s in flask.request.args.get("series", "").split(",") if s]
+    data = recorder.get_job(job, series or None)
+
+    if data is None:
+        return flask.jsonify({"error": "job not found"}), 404
+
+    resp = flask.jsonify(data)
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
+
+@p1s_bp.route("/api/p1s/mqtt/stats")
+def api_p1s_mqtt_stats():
+    from scripts import bambu_api
+
+    return {
+        "readiness": bambu_api.get_readiness(),
+        "session": bambu_api.get_mqtt_stats(),
+        "persistence": bambu_api.get_persist_stats(),
+    }
 
 @p1s_bp.route("/api/p1s/launch_bambu", methods=["POST"])
 def launch_bambu_studio():
-    pc_ip = flask.current_app.config["PC_IP"]
-    pc_port = flask.current_app.config["PC_PORT"]
-    token = flask.current_app.config["SECRET_TOKEN"]
+    bridge: PCBridge = flask.current_app.config["PC_BRIDGE"]
 
     try:
-        import requests
-
-        url = f"http://{pc_ip}:{pc_port}/launch_bambu"
-        res = requests.get(url, params={"token": token}, timeout=3)
+        res = bridge.get("launch_bambu")
 
         if res.status_code != 200:
             return {"success": False}, 500
@@ -86,30 +127,131 @@ def launch_bambu_studio():
 
 @p1s_bp.route("/api/p1s/pc_health")
 def pc_health():
-    pc_ip = flask.current_app.config["PC_IP"]
-    pc_port = flask.current_app.config["PC_PORT"]
+    """
+    Served from the background PCHealthMonitor — never waits on the PC.
+    """
+    monitor: PCHealthMonitor = flask.current_app.config.get("PC_HEALTH")
 
-    try:
-        import requests
-        res = requests.get(f"http://{pc_ip}:{pc_port}/health", timeout=1.5)
-        return {"online": res.status_code == 200}
-    except Exception:
+    if monitor is None:
         return {"online": False}
 
+    resp = flask.jsonify(monitor.get_state())
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
+
 # ==================================================
 # Camera
 # ==================================================
 
 @p1s_bp.route("/p1s/camera")
 def p1s_camera():
+    """MJPEG stream. ?profile=thumb|kiosk|full (default full)."""
     bambu_camera: BambuMJPEGCamera = current_app.config["BAMBU_CAMERA"]
 
+    profile = flask.request.args.get("profile", DEFAULT_PROFILE)
+    if profile not in PROFILES:
+        return flask.jsonify({"error": f"unknown profile, use one of {sorted(PROFILES)}"}), 400
+
     return flask.Response(
-        bambu_camera.mjpeg_generator(),
+        bambu_camera.mjpeg_generator(remote=flask.request.remote_addr, profile=profile),
         mimetype="multipart/x-mixed-replace; boundary=frame"
     )
 
 
+@p1s_bp.route("/p1s/camera/snapshot.jpg")
+def p1s_camera_snapshot():
+    """Latest camera frame as a single JPEG. ?profile=thumb|kiosk|full."""
+    bambu_camera: BambuMJPEGCamera = current_app.config["BAMBU_CAMERA"]
+
+    profile = flask.request.args.get("profile", DEFAULT_PROFILE)
+    if profile not in PROFILES:
+        return flask.jsonify({"error": f"unknown profile, use one of {sorted(PROFILES)}"}), 400
+
+    snap = bambu_camera.get_snapshot(profile) if bambu_camera is not None else None
+    if snap is None:
+        return flask.jsonify({"error": "no camera frame yet"}), 503
+
+    seq, ts, frame = snap
+    resp = flask.Response(frame, mimetype="image/jpeg")
+    resp.set_etag(f"{bambu_camera.started_at:.0f}-{seq}-{profile}")
+    resp.last_modified = ts
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp.make_conditional(flask.request)
+
+
+@p1s_bp.route("/p1s/camera/stats")
+def p1s_camera_stats():
+    """Camera fps + per-viewer sent / skipped frame counts."""
+    bambu_camera: BambuMJPEGCamera = current_app.config["BAMBU_CAMERA"]
+
+    if bambu_camera is None:
+        return {"running": False}
+
+    resp = flask.jsonify(bambu_camera.get_stats())
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
+
+
+@p1s_bp.route("/api/p1s/timelapse")
+def p1s_timelapse():
+    """Layer-timelapse recorder state + recorded jobs."""
+    recorder = current_app.config["P1S_TIMELAPSE"]
+    assembler = current_app.config["P1S_TIMELAPSE_VIDEO"]
+
+    if recorder is None:
+        return {"enabled": False, "jobs": [], "videos": []}
+
+    return flask.jsonify({
+        "enabled": True,
+        **recorder.get_stats(),
+        "jobs": recorder.list_jobs(),
+        "videos": assembler.list_videos(),
+    })
+
+
+@p1s_bp.route("/api/p1s/timelapse/<job>/video", methods=["POST"])
+def p1s_timelapse_video_build(job):
+    """(Re)assemble a job's frames into a video in the background."""
+    assembler = current_app.config["P1S_TIMELAPSE_VIDEO"]
+    if assembler is None:
+        return {"success": False, "error": "timelapse not enabled"}, 503
+
+    status = assembler.request(job)
+    if status is None:
+        return {"success": False, "error": "no frames for this job"}, 404
+
+    return {
+        "success": True,
+        "status_url": flask.url_for("p1s.p1s_timelapse_video_status", job=job),
+        **status,
+    }, 202
+
+
+@p1s_bp.route("/api/p1s/timelapse/<job>/video/status")
+def p1s_timelapse_video_status(job):
+    assembler = current_app.config["P1S_TIMELAPSE_VIDEO"]
+    if assembler is None:
+        return {"success": False, "error": "timelapse not enabled"}, 503
+
+    status = assembler.get_status(job)
+    if status is None:
+        return {"success": False, "error": "invalid job"}, 400
+
+    return {"success": True, **status}
+
+
+@p1s_bp.route("/api/p1s/timelapse/<job>/video")
+def p1s_timelapse_video_download(job):
+    """Finished timelapse video (supports Range / conditional requests)."""
+    assembler = current_app.config["P1S_TIMELAPSE_VIDEO"]
+    path = assembler.video_path(job) if assembler is not None else None
+
+    if path is None:
+        return {"success": False, "error": "no video for this job"}, 404
+
+    return flask.send_file(path, as_attachment=True, download_name=path.name, conditional=True)
+
+
 @p1s_bp.route("/p1s/camera/view")
 def p1s_camera_view():
     return flask.render_template("p1s/p1s_camera.html")
@@ -1,5 +1,4 @@
 import flask
-import requests
 from flask import current_app
 from collections import Counter
 
@@ -9,6 +8,7 @@ from scripts.steam_api import (
     get_top_games,
     get_friends_status
 )
+from scripts.pc_bridge import PCBridge
 from scripts.steam_helpers import (
     load_pinned_games,
     save_pinned_games,
@@ -172,16 +172,10 @@ def api_steam_friend_pin():
 # -----------------------------
 @steam_bp.route("/open_steam/<appid>")
 def open_steam_game(appid):
-    pc_ip = current_app.config["PC_IP"]
-    pc_port = current_app.config["PC_PORT"]
-    secret_token = current_app.config["SECRET_TOKEN"]
+    bridge: PCBridge = current_app.config["PC_BRIDGE"]
 
     try:
-        requests.get(
-            f"http://{pc_ip}:{pc_port}/launch_steam",
-            params={"appid": appid, "token": secret_token},
-            timeout=5
-        )
+        bridge.get("launch_steam", params={"appid": appid})
         return flask.jsonify({"success": True})
     except Exception as e:
         return flask.jsonify({"success": False, "error": str(e)}), 500
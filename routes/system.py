@@ -46,11 +46,73 @@ def system_stats():
 # ------------------
 @system_bp.route("/api/system-stats")
 def api_system_stats():
-    return flask.jsonify({
-        "cpu": psutil.cpu_percent(interval=0.5),
-        "ram": psutil.virtual_memory().percent,
-        "disk": psutil.disk_usage('/').percent
-    })
+    # Latest sample from the background sampler (no blocking CPU read)
+    sampler = current_app.config["SYSTEM_STATS"]
+    sample = sampler.latest()
+    if sample is None:
+        return flask.jsonify({"error": "no sample yet"}), 503
+    return flask.jsonify(sample)
+
+
+@system_bp.route("/api/system-stats/history")
+def api_system_stats_history():
+    # ?window=<seconds> (default 60, capped by the ring capacity)
+    sampler = current_app.config["SYSTEM_STATS"]
+    window = flask.request.args.get("window", 60, type=float)
+
+    if window <= 0:
+        return flask.jsonify({"error": "window must be positive"}), 400
+
+    return flask.jsonify(sampler.history(window))
+
+
+@system_bp.route("/api/system-stats/range")
+def api_system_stats_range():
+    """
+    Trend data from the rollup store.
+    ?span=<seconds back from now>  or  ?start=<unix>&end=<unix>
+    ?metrics=cpu,temp   (default: all)
+    ?resolution=1s|1m|1h (default: finest tier that fits)
+    """
+    trends = current_app.config["SYSTEM_TRENDS"]
+    args = flask.request.args
+
+    end = args.get("end", type=float) or time.time()
+    span = args.get("span", type=float)
+    start = args.get("start", type=float)
+    if start is None:
+        start = end - (span or 3600)
+
+    if start >= end:
+        return flask.jsonify({"error": "start must be before end"}), 400
+
+    metrics = [m for m in args.get("metrics", "").split(",") if m] or None
+
+    try:
+        result = trends.range(
+            start,
+            end,
+            metrics=metrics,
+            resolution=args.get("resolution"),
+        )
+    except ValueError as e:
+        return flask.jsonify({"error": str(e)}), 400
+
+    return flask.jsonify(result)
+
+
+@system_bp.route("/api/system-stats/tiers")
+def api_system_stats_tiers():
+    return flask.jsonify(current_app.config["SYSTEM_TRENDS"].get_tiers())
+
+
+@system_bp.route("/api/system/pc-bridge")
+def api_pc_bridge_stats():
+    bridge = current_app.config.get("PC_BRIDGE")
+    if bridge is None:
+        return flask.jsonify({"configured": False})
+
+    return flask.jsonify(bridge.get_stats())
 
 
 # ------------------
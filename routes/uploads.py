@@ -11,7 +11,8 @@ from flask import (
 )
 from pathlib import Path
 import time
-import requests
+
+from scripts.pc_bridge import PCBridge
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -75,17 +76,14 @@ def upload_file():
     # ==================================================
     #Notify PC to download file
     # ==================================================
-    pc_ip = current_app.config.get("PC_IP")
-    pc_port = current_app.config.get("PC_PORT", 5001)
-    token = current_app.config.get("SECRET_TOKEN")
+    bridge: PCBridge = current_app.config["PC_BRIDGE"]
 
-    if pc_ip and token:
+    if bridge.configured and bridge.token:
         try:
-            requests.post(
-                f"http://{pc_ip}:{pc_port}/download_file",
-                params={"token": token},
+            bridge.post(
+                "download_file",
                 json={"filename": dest.name},
-                timeout=5,
+                token_in="params",
             )
         except Exception as e:
             # PC might be offline — upload still succeeds
@@ -1,7 +1,8 @@
 import flask
-import requests
 from flask import current_app
 
+from scripts.pc_bridge import PCBridge
+
 websites_bp = flask.Blueprint("websites", __name__)
 
 @websites_bp.route("/websites", endpoint="websites")
@@ -17,9 +18,7 @@ def websites():
 
 @websites_bp.route("/open_site/<site_name>")
 def open_site(site_name):
-    pc_ip = current_app.config["PC_IP"]
-    pc_port = current_app.config["PC_PORT"]
-    secret_token = current_app.config["SECRET_TOKEN"]
+    bridge: PCBridge = current_app.config["PC_BRIDGE"]
 
     site_map = {
         "YouTube": "https://www.youtube.com",
@@ -32,10 +31,6 @@ def open_site(site_name):
     if not url:
         return flask.jsonify({"success": False, "error": "Unknown site"}), 404
 
-    requests.get(
-        f"http://{pc_ip}:{pc_port}/open",
-        params={"url": url, "token": secret_token},
-        timeout=5
-    )
+    bridge.get("open", params={"url": url})
 
     return flask.jsonify({"success": True, "site": site_name})
@@ -1,3 +1,5 @@
+import os
+import atexit
 import threading
 import time
 import json
@@ -5,7 +7,8 @@ from pathlib import Path
 from collections import deque
 from dotenv import load_dotenv
 
-from bambulab import BambuAuthenticator, BambuClient, MQTTClient
+# bambulab is imported by the background connect, not at module import
+from scripts.bambu_mqtt import BambuMQTTSession
 
 # ============================================================
 # Paths / Environment
@@ -13,22 +16,33 @@ from bambulab import BambuAuthenticator, BambuClient, MQTTClient
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_PATH = BASE_DIR / "data" / "p1s_full_state.json"
+JOURNAL_PATH = BASE_DIR / "data" / "p1s_full_state.journal"
+IDENTITY_PATH = BASE_DIR / "data" / "bambu_identity.json"
 DATA_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 load_dotenv(BASE_DIR / "envs" / "Bambu_Keys.env")
 
 # ============================================================
-# Authenticate
+# Identity (filled in by the background connect, NOT at import)
 # ============================================================
 
-auth = BambuAuthenticator()
-token = auth.get_or_create_token()
-
-client = BambuClient(token=token)
-profile = client.get_user_profile()
-
-UID = str(profile["uid"])
-SERIAL = client.get_devices()[0]["dev_id"]
+token = None
+UID = None
+SERIAL = None
+
+CONNECT_TIMEOUT = 20                 # seconds to wait for the MQTT handshake
+RETRY_DELAYS = (5, 15, 60, 300)      # backoff between failed attempts
+
+# idle -> connecting -> ready (or error, then connecting again)
+_readiness = {
+    "state": "idle",
+    "since": None,
+    "source": None,        # "cache" | "cloud"
+    "attempts": 0,
+    "error": None,
+    "ready_ms": None,
+}
+_mqtt = None
 
 # ============================================================
 # Shared State
@@ -50,8 +64,33 @@ _state = {
 
 _master = {"print": {}}
 _last_update_ts = None
+_listeners = []                  # fn(print_state, ts) per merged message
 _last_messages = deque(maxlen=25)
 
+# ---- Persistence (snapshot + append-only delta journal) ----
+FLUSH_INTERVAL = 5               # seconds between journal appends (only when dirty)
+COMPACT_BYTES = 256 * 1024       # rewrite the snapshot once the journal passes this
+
+_seq = 0                         # bumped per merged MQTT delta
+_saved_seq = 0                   # highest seq already on disk
+_pending = []                    # (seq, ts, delta) not yet journaled
+_persist_lock = threading.Lock() # one writer at a time (thread + atexit)
+_journal_dirty = False           # a failed append may have left a torn line
+
+# ---- Versioned read snapshot for /api/p1s/full ----
+# seq survives restarts (snapshot + journal); the boot token keeps an ETag
+# from a previous run from matching if a crash lost unflushed deltas
+_BOOT = format(int(time.time()), "x")
+_full_cache = {"seq": None, "print": None, "last_update_ts": None}
+_persist_stats = {
+    "journal_writes": 0,
+    "journal_bytes": 0,
+    "compactions": 0,
+    "bytes_written": 0,
+    "errors": 0,
+    "last_write": None,
+}
+
 # ============================================================
 # Recursive merge
 # ============================================================
@@ -76,40 +115,74 @@ def _round(val, fallback):
         return fallback
 
 # ============================================================
-# Load snapshot (seed state)
+# Load snapshot + replay journal (seed state)
 # ============================================================
 
-if DATA_PATH.exists():
-    try:
-        with open(DATA_PATH) as f:
-            saved = json.load(f)
+def _load_persisted():
+    global _last_update_ts, _seq, _saved_seq
 
-        if isinstance(saved.get("print"), dict):
-            with _lock:
-                _merge(_master["print"], saved["print"])
-                _last_update_ts = saved.get("last_update_ts")
-
-                p = _master["print"]
-                _state.update({
-                    "state": p.get("gcode_state", "UNKNOWN"),
-                    "progress": _to_int(p.get("mc_percent"), 0),
-                    "eta_minutes": _to_int(p.get("mc_remaining_time"), None),
-                    "nozzle": _round(p.get("nozzle_temper"), None),
-                    "nozzle_target": _round(p.get("nozzle_target_temper"), None),
-                    "bed": _round(p.get("bed_temper"), None),
-                    "bed_target": _round(p.get("bed_target_temper"), None),
-                    "connected": True,
-                    "last_update_ts": _last_update_ts,
-                })
+    try:
+        saved = json.loads(DATA_PATH.read_text())
+    except FileNotFoundError:
+        saved = {}
     except Exception as e:
         print("Snapshot load failed:", e)
+        saved = {}
+
+    with _lock:
+        if isinstance(saved.get("print"), dict):
+            _merge(_master["print"], saved["print"])
+            _last_update_ts = saved.get("last_update_ts")
+        _seq = int(saved.get("seq", 0))
+
+        # Deltas appended after that snapshot (a torn last line is skipped)
+        replayed = 0
+        try:
+            with open(JOURNAL_PATH) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if entry.get("seq", 0) <= _seq:
+                        continue
+                    _merge(_master["print"], entry["print"])
+                    _last_update_ts = entry.get("ts", _last_update_ts)
+                    _seq = entry["seq"]
+                    replayed += 1
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print("Journal replay failed:", e)
+
+        # Fully persisted already; the first compaction folds the journal in
+        _saved_seq = _seq
+
+        if _master["print"]:
+            p = _master["print"]
+            _state.update({
+                "state": p.get("gcode_state", "UNKNOWN"),
+                "progress": _to_int(p.get("mc_percent"), 0),
+                "eta_minutes": _to_int(p.get("mc_remaining_time"), None),
+                "nozzle": _round(p.get("nozzle_temper"), None),
+                "nozzle_target": _round(p.get("nozzle_target_temper"), None),
+                "bed": _round(p.get("bed_temper"), None),
+                "bed_target": _round(p.get("bed_target_temper"), None),
+                "connected": True,
+                "last_update_ts": _last_update_ts,
+            })
+
+    if replayed:
+        print(f"Bambu state: replayed {replayed} journal entries", flush=True)
+
+_load_persisted()
 
 # ============================================================
 # MQTT callback
 # ============================================================
 
 def _on_message(device_id, data):
-    global _last_update_ts
+    global _last_update_ts, _seq
 
     if not isinstance(data, dict):
         return
@@ -122,6 +195,10 @@ def _on_message(device_id, data):
         _merge(_master["print"], delta)
         _last_update_ts = time.time()
 
+        # Dirty tracking: the persister journals exactly these deltas
+        _seq += 1
+        _pending.append((_seq, _last_update_ts, delta))
+
         p = _master["print"]
         state = p.get("gcode_state", _state["state"])
 
@@ -152,82 +229,313 @@ def _on_message(device_id, data):
             _state["eta_minutes"] = None
             _state["nozzle_target"] = 0
             _state["bed_target"] = 0
-            return
 
         # ---- ETA sanity (Bambu reports 0 early) ----
-        if state == "RUNNING" and _state["eta_minutes"] == 0:
+        elif state == "RUNNING" and _state["eta_minutes"] == 0:
             _state["eta_minutes"] = None
 
+        # Shallow copy for listeners (they run outside the lock)
+        sample = dict(p) if _listeners else None
+        ts = _last_update_ts
+
+    for fn in _listeners if sample is not None else ():
+        try:
+            fn(sample, ts)
+        except Exception as e:
+            print("Bambu listener failed:", e, flush=True)
+
 # ============================================================
-# Persistence
+# Background connect (cached identity first, cloud on miss)
 # ============================================================
 
-def _persist_loop():
-    while True:
-        time.sleep(30)
-        try:
-            with _lock:
-                snapshot = {
-                    "print": _master["print"],
-                    "last_update_ts": _last_update_ts,
-                }
+def _set_readiness(state, **extra):
+    with _lock:
+        _readiness["state"] = state
+        _readiness["since"] = time.time()
+        _readiness.update(extra)
 
-            with open(DATA_PATH, "w") as f:
-                json.dump(snapshot, f, indent=2)
+def _load_identity():
+    try:
+        data = json.loads(IDENTITY_PATH.read_text())
+    except Exception:
+        data = {}
 
-        except Exception as e:
-            print("Persist error:", e)
+    serial = os.getenv("BAMBU_P1S_SERIAL") or data.get("serial")
+    return data.get("uid"), serial
+
+def _save_identity(uid, serial):
+    try:
+        tmp = IDENTITY_PATH.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"uid": uid, "serial": serial}, indent=2))
+        tmp.replace(IDENTITY_PATH)
+    except Exception as e:
+        print("Bambu identity save failed:", e, flush=True)
+
+def _authenticate(use_cache):
+    """Fill token / UID / SERIAL. Warm starts never touch the cloud."""
+    global token, UID, SERIAL
+
+    from bambulab import BambuAuthenticator, BambuClient
+
+    auth = BambuAuthenticator(token_file=os.getenv("BAMBU_TOKEN_PATH"))
+
+    if use_cache:
+        uid, serial = _load_identity()
+        saved = auth.load_token()
+        if uid and serial and saved:
+            token, UID, SERIAL = saved, uid, serial
+            return "cache"
+
+    token = auth.get_or_create_token()
+    client = BambuClient(token=token)
+
+    UID = str(client.get_user_profile()["uid"])
+    SERIAL = os.getenv("BAMBU_P1S_SERIAL") or client.get_devices()[0]["dev_id"]
+
+    _save_identity(UID, SERIAL)
+    return "cloud"
+
+def _connect_mqtt():
+    # One managed session for the process: reconnects, keep-alive pushall
+    session = BambuMQTTSession(UID, token, SERIAL, on_message=_on_message)
+    session.start()
+
+    # Retries are _connect_worker's job (RETRY_DELAYS), not the session's
+    if not session.wait_connected(CONNECT_TIMEOUT):
+        session.stop()
+        error = session.last_error() or "MQTT handshake timed out (token or serial rejected?)"
+        raise ConnectionError(error)
+
+    return session
+
+def _connect_worker():
+    global _mqtt
+
+    start = time.monotonic()
+    use_cache = True
+    attempt = 0
+
+    while True:
+        attempt += 1
+        _set_readiness("connecting", attempts=attempt)
 
-threading.Thread(target=_persist_loop, daemon=True).start()
+        try:
+            source = _authenticate(use_cache)
+            _mqtt = _connect_mqtt()
+            _mqtt.request_pushall()
+        except Exception as e:
+            print(f"Bambu connect attempt {attempt} failed:", e, flush=True)
+            _set_readiness("error", error=str(e))
+
+            # A cached identity that did not work is re-fetched next time
+            use_cache = False
+            time.sleep(RETRY_DELAYS[min(attempt - 1, len(RETRY_DELAYS) - 1)])
+            continue
+
+        _set_readiness(
+            "ready",
+            source=source,
+            error=None,
+            ready_ms=round((time.monotonic() - start) * 1000, 1),
+        )
+        print(f"Bambu ready ({source}) in {_readiness['ready_ms']} ms", flush=True)
+        return
 
 # ============================================================
-# Keep-alive (periodic pushall)
+# Persistence
 # ============================================================
 
-def _keepalive_loop():
+def _compact_dumps(obj):
+    return json.dumps(obj, separators=(",", ":"))
+
+def _flush_state():
+    """Append pending deltas to the journal; compact when it grows large."""
+    with _persist_lock:
+        _flush_locked()
+
+def _flush_locked():
+    global _saved_seq, _journal_dirty
+
+    with _lock:
+        if not _pending:
+            return
+        count = len(_pending)
+        lines = "".join(
+            _compact_dumps({"seq": seq, "ts": ts, "print": delta}) + "\n"
+            for seq, ts, delta in _pending
+        )
+        upto = _pending[-1][0]
+
+    try:
+        with open(JOURNAL_PATH, "a") as f:
+            f.write(lines)
+            size = f.tell()
+    except Exception as e:
+        # Full / read-only card: keep the deltas pending for the next flush
+        print("Persist error:", e)
+        with _lock:
+            _persist_stats["errors"] += 1
+        _journal_dirty = True
+        return
+
+    with _lock:
+        # Deltas merged while writing stay queued behind the written ones
+        del _pending[:count]
+        _saved_seq = upto
+        _persist_stats["journal_writes"] += 1
+        _persist_stats["bytes_written"] += len(lines)
+        _persist_stats["journal_bytes"] = size
+        _persist_stats["last_write"] = time.time()
+
+    # After a failed append the journal may hold a torn line that would
+    # swallow the next entry on replay: fold everything into a snapshot
+    if size >= COMPACT_BYTES or _journal_dirty:
+        _journal_dirty = not _compact_locked()
+
+def _compact_state():
+    """Atomically rewrite the snapshot (with its seq), then drop the journal."""
+    with _persist_lock:
+        _compact_locked()
+
+def _compact_locked():
+    with _lock:
+        payload = _compact_dumps({
+            "seq": _saved_seq,
+            "print": _master["print"],
+            "last_update_ts": _last_update_ts,
+        })
+        # Deltas newer than _saved_seq are already in _master: keep them
+        # pending so they are journaled after the snapshot and replay
+        # (which skips seq <= snapshot seq) stays idempotent
+
+    try:
+        tmp = DATA_PATH.with_suffix(".tmp")
+        tmp.write_text(payload)
+        tmp.replace(DATA_PATH)
+
+        # A crash before this truncate only leaves entries replay skips
+        open(JOURNAL_PATH, "w").close()
+    except Exception as e:
+        print("Compaction error:", e)
+        with _lock:
+            _persist_stats["errors"] += 1
+        return False
+
+    with _lock:
+        _persist_stats["compactions"] += 1
+        _persist_stats["bytes_written"] += len(payload)
+        _persist_stats["journal_bytes"] = 0
+    return True
+
+def _persist_loop():
+    # Fold a journal left by the previous run into a fresh snapshot
+    if JOURNAL_PATH.exists() and JOURNAL_PATH.stat().st_size:
+        _compact_state()
+
+    # Writes follow printer activity: nothing changed -> nothing written
     while True:
-        time.sleep(180)  # every 3 minutes
+        time.sleep(FLUSH_INTERVAL)
         try:
-            mqtt = MQTTClient(UID, token, SERIAL)
-            mqtt.publish(
-                f"device/{SERIAL}/request",
-                {"pushing": {"command": "pushall"}}
-            )
-        except Exception:
-            pass
-
-threading.Thread(target=_keepalive_loop, daemon=True).start()
+            _flush_state()
+        except Exception as e:
+            print("Persist error:", e)
 
 # ============================================================
-# MQTT start
+# Start (non-blocking; called once from FlaskControlCenter.py)
 # ============================================================
 
 _started = False
 
 def start_bambu():
+    """Start auth + MQTT session and persistence in the background."""
     global _started
     if _started:
         return
     _started = True
 
-    def _run():
-        mqtt = MQTTClient(UID, token, SERIAL, on_message=_on_message)
-        mqtt.connect(blocking=True)
-
-        mqtt.publish(
-            f"device/{SERIAL}/request",
-            {"pushing": {"command": "pushall"}}
-        )
-
-    threading.Thread(target=_run, daemon=True).start()
+    for target in (_connect_worker, _persist_loop):
+        threading.Thread(target=target, daemon=True).start()
 
-# Auto-start on import
-start_bambu()
+    # Journal whatever arrived since the last flush
+    atexit.register(_flush_state)
 
 # ============================================================
 # Public API
 # ============================================================
 
+def get_readiness():
+    """{"state": idle|connecting|ready|error, "connected", ...}"""
+    with _lock:
+        out = dict(_readiness)
+    out["connected"] = bool(_mqtt is not None and _mqtt.is_connected())
+    return out
+
+def add_listener(fn):
+    """Call fn(print_state, ts) after every merged MQTT message (MQTT thread)."""
+    _listeners.append(fn)
+
+def get_state_version():
+    """Changes whenever an MQTT delta is merged (cheap; for ETags)."""
+    with _lock:
+        return f"{_BOOT}-{_seq}"
+
+def _project(tree, fields):
+    # "layer_num", "ams.tray_now" -> same nesting, missing paths omitted
+    out = {}
+    for path in fields:
+        node = tree
+        parts = path.split(".")
+        for part in parts:
+            if not isinstance(node, dict) or part not in node:
+                break
+            node = node[part]
+        else:
+            dest = out
+            for part in parts[:-1]:
+                dest = dest.setdefault(part, {})
+            dest[parts[-1]] = node
+    return out
+
+def get_full_state(fields=None):
+    """
+    Full merged printer state (same shape as p1s_full_state.json) plus
+    "version". The copy is made once per version and shared by readers
+    (treat it as read-only). fields: optional list of print keys /
+    dotted paths to return instead of the whole tree.
+    """
+    with _lock:
+        if _full_cache["seq"] != _seq:
+            _full_cache["print"] = json.loads(_compact_dumps(_master["print"]))
+            _full_cache["last_update_ts"] = _last_update_ts
+            _full_cache["seq"] = _seq
+
+        version = f"{_BOOT}-{_full_cache['seq']}"
+        tree = _full_cache["print"]
+        ts = _full_cache["last_update_ts"]
+
+    return {
+        "version": version,
+        "print": _project(tree, fields) if fields else tree,
+        "last_update_ts": ts,
+    }
+
+def get_persist_stats():
+    with _lock:
+        return {
+            "seq": _seq,
+            "saved_seq": _saved_seq,
+            "pending": len(_pending),
+            **_persist_stats,
+        }
+
+def get_mqtt_stats():
+    """Connection / message-rate stats of the MQTT session (None before connect)."""
+    return _mqtt.get_stats() if _mqtt is not None else None
+
+def publish_command(command):
+    """Send a command on the existing MQTT connection. False if offline."""
+    return _mqtt is not None and _mqtt.publish(command)
+
 def get_raw_state():
     """
     Returns raw printer state for bambu_helper.py
@@ -238,7 +546,7 @@ def get_raw_state():
     """
     with _lock:
         if not _state["connected"]:
-            return {"connected": False}
+            return {"connected": False, "readiness": _readiness["state"]}
 
         now = time.time()
         last = _last_update_ts or 0
@@ -3,31 +3,237 @@ Bambu MJPEG Camera Helper
 ========================
 
 Pure helper module:
-- Manages a persistent JPEGFrameStream connection
+- Manages the JPEGFrameStream connection on demand: viewers are
+  reference counted (acquire / release); the stream connects when the
+  first viewer arrives and disconnects IDLE_GRACE seconds after the last
+  one leaves
+- While idle, a low-rate snapshot mode connects just long enough for one
+  frame every SNAPSHOT_INTERVAL seconds, so the latest frame stays fresh
+- grab() asks for one fresh frame through that same one-frame session
+  (no refcount, no idle grace), e.g. for timelapse captures
 - Runs a background thread to pull frames
 - Exposes latest JPEG frame and an MJPEG generator
+- Output profiles (PROFILES: thumb / kiosk / full): each source frame is
+  downscaled + re-encoded with Pillow at most once per profile, on first
+  demand, and the result is shared by every viewer of that profile
+- Frames go through a FrameBroadcaster: each new frame gets a sequence
+  number and wakes viewers through a Condition, so every viewer sends
+  each frame at most once and only when the camera produced one
 
 NO Flask code in here.
 """
 
 import time
+import itertools
 import threading
-from bambulab import JPEGFrameStream
+from collections import deque
 
+FPS_WINDOW = 10.0           # seconds of frames behind the fps figure
+CLIENT_IDLE_WAKE = 5.0      # generator wake-up when no frames arrive
 
+IDLE_GRACE = 30.0           # seconds the stream stays up after the last viewer
+SNAPSHOT_INTERVAL = 60.0    # seconds between idle snapshots (0 = stay disconnected)
+RETRY_DELAY = 2.0           # seconds after a failed connect / dropped stream
+
+# profile -> (max width px, JPEG quality); None = source frame untouched
+PROFILES = {
+    "thumb": (320, 60),
+    "kiosk": (800, 75),
+    "full": (None, None),
+}
+DEFAULT_PROFILE = "full"
+
+
+def _reencode(frame: bytes, width: int, quality: int) -> bytes:
+    # Pillow is imported on first use, not at app start
+    from io import BytesIO
+    from PIL import Image
+
+    img = Image.open(BytesIO(frame))
+    if img.width > width:
+        height = round(img.height * width / img.width)
+        img.draft("RGB", (width, height))     # JPEG DCT scaling: decode smaller
+        img = img.convert("RGB").resize((width, height), Image.BILINEAR)
+
+    out = BytesIO()
+    img.save(out, "JPEG", quality=quality, optimize=False)
+    return out.getvalue()
+
+
+# ==================================================
+# Profile encoder
+# ==================================================
+class _ProfileEncoder:
+    """Latest re-encode of one profile; one encode per source seq."""
+
+    def __init__(self, name, width, quality):
+        self.name = name
+        self.width = width
+        self.quality = quality
+
+        self._lock = threading.Lock()   # held while encoding (single flight)
+        self._seq = None
+        self._frame = None
+
+        self.encodes = 0
+        self.errors = 0
+        self.encode_ms = 0.0
+
+    def get(self, seq, source):
+        if self.width is None:
+            return source
+
+        with self._lock:
+            if self._seq != seq:
+                start = time.perf_counter()
+                try:
+                    self._frame = _reencode(source, self.width, self.quality)
+                    self.encodes += 1
+                    self.encode_ms += (time.perf_counter() - start) * 1000
+                except Exception as e:
+                    # Undecodable frame: pass the source through
+                    self.errors += 1
+                    print(f"Camera {self.name} re-encode failed:", e, flush=True)
+                    self._frame = source
+                self._seq = seq
+            return self._frame
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "width": self.width,
+                "quality": self.quality,
+                "encodes": self.encodes,
+                "errors": self.errors,
+                "avg_encode_ms": round(self.encode_ms / self.encodes, 1) if self.encodes else None,
+                "frame_bytes": len(self._frame) if self._frame else None,
+            }
+
+
+# ==================================================
+# Frame broadcaster
+# ==================================================
+class FrameBroadcaster:
+    """Latest frame + sequence number; subscribers wait for the next one."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._frame = None
+        self._seq = 0
+        self._frame_ts = None
+        self._recent = deque()      # publish timestamps (FPS_WINDOW)
+
+        self._ids = itertools.count(1)
+        self._clients = {}          # id -> stats dict
+
+    def publish(self, frame: bytes):
+        now = time.time()
+        with self._cond:
+            self._frame = frame
+            self._seq += 1
+            self._frame_ts = now
+            self._recent.append(now)
+            self._trim_locked(now)
+            self._cond.notify_all()
+
+    def latest(self):
+        """(seq, frame) — frame is None before the first one."""
+        with self._cond:
+            return self._seq, self._frame
+
+    def snapshot(self):
+        """(seq, frame timestamp, frame) of the latest frame."""
+        with self._cond:
+            return self._seq, self._frame_ts, self._frame
+
+    def wait_next(self, after_seq: int, timeout: float = None):
+        """Block until a frame newer than after_seq exists: (seq, frame) or (after_seq, None)."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > after_seq and self._frame is not None, timeout):
+                return after_seq, None
+            return self._seq, self._frame
+
+    def subscribe(self, remote: str = None, profile: str = None) -> int:
+        client_id = next(self._ids)
+        with self._cond:
+            self._clients[client_id] = {
+                "id": client_id,
+                "remote": remote,
+                "profile": profile,
+                "connected_at": time.time(),
+                "sent": 0,
+                "skipped": 0,
+                "bytes": 0,
+            }
+        return client_id
+
+    def unsubscribe(self, client_id: int):
+        with self._cond:
+            self._clients.pop(client_id, None)
+
+    def record(self, client_id: int, size: int, skipped: int):
+        with self._cond:
+            c = self._clients.get(client_id)
+            if c is not None:
+                c["sent"] += 1
+                c["skipped"] += skipped
+                c["bytes"] += size
+
+    def get_stats(self) -> dict:
+        now = time.time()
+        with self._cond:
+            self._trim_locked(now)
+            return {
+                "seq": self._seq,
+                "fps": round(len(self._recent) / FPS_WINDOW, 2),
+                "frame_age": round(now - self._frame_ts, 2) if self._frame_ts else None,
+                "frame_bytes": len(self._frame) if self._frame else None,
+                "clients": [dict(c) for c in self._clients.values()],
+            }
+
+    def _trim_locked(self, now):
+        cutoff = now - FPS_WINDOW
+        while self._recent and self._recent[0] < cutoff:
+            self._recent.popleft()
+
+
+# ==================================================
+# Camera
+# ==================================================
 class BambuMJPEGCamera:
     def __init__(self, printer_ip: str, access_code: str):
         self.printer_ip = printer_ip
         self.access_code = access_code
 
-        self._latest_frame = None
-        self._lock = threading.Lock()
+        self.frames = FrameBroadcaster()
+        self._profiles = {
+            name: _ProfileEncoder(name, width, quality)
+            for name, (width, quality) in PROFILES.items()
+        }
 
         self._running = False
         self._thread = None
 
+        # Demand: viewer refcount, wakes the worker out of idle
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._viewers = 0
+        self._last_release = None
+        self._grabs = 0                 # grab() calls waiting for a frame
+        self._grab_seq = 0              # ... newer than this seq
+
         # For debug / visibility
         self.started_at = None
+        self._mode = "off"              # off | live | snapshot | idle
+        self._connected_since = None
+        self._connected_total = 0.0     # seconds, closed connections only
+        self._stats = {
+            "connects": 0,
+            "connect_errors": 0,
+            "snapshots": 0,
+            "grabs": 0,
+        }
+        self._last_error = None
 
     # -------------------------
     # Public API
@@ -47,57 +253,198 @@ class BambuMJPEGCamera:
         )
         self._thread.start()
 
+    def stop(self):
+        self._running = False
+        self._wake.set()
+
     def get_frame(self):
         """Return the latest JPEG frame (bytes) or None."""
+        return self.frames.latest()[1]
+
+    def get_snapshot(self, profile: str = DEFAULT_PROFILE):
+        """(seq, timestamp, JPEG bytes) of the latest frame in `profile`, or None."""
+        seq, ts, frame = self.frames.snapshot()
+        if frame is None:
+            return None
+        return seq, ts, self._profiles[profile].get(seq, frame)
+
+    def grab(self, timeout: float = 10.0):
+        """
+        A frame captured after this call, or None on timeout. Blocks the
+        caller, never the camera worker. While idle this is a one-frame
+        snapshot session: the stream does NOT stay up for IDLE_GRACE.
+        """
+        seq, _ = self.frames.latest()
+        with self._lock:
+            self._grabs += 1
+            self._grab_seq = max(self._grab_seq, seq)
+            self._stats["grabs"] += 1
+        self._wake.set()
+
+        try:
+            _, frame = self.frames.wait_next(seq, timeout)
+        finally:
+            with self._lock:
+                self._grabs -= 1
+        return frame
+
+    def acquire(self):
+        """A viewer needs live frames: connect now if idle."""
         with self._lock:
-            return self._latest_frame
+            self._viewers += 1
+        self._wake.set()
 
-    def mjpeg_generator(self):
+    def release(self):
+        with self._lock:
+            self._viewers = max(0, self._viewers - 1)
+            self._last_release = time.time()
+
+    def mjpeg_generator(self, remote: str = None, profile: str = DEFAULT_PROFILE):
         """
         Generator yielding multipart MJPEG frames.
         Intended to be used directly in a Flask Response.
+
+        Sleeps on the broadcaster until a NEW frame exists; frames that
+        arrive while this client is still sending count as skipped.
         """
-        while True:
-            frame = self.get_frame()
+        encoder = self._profiles[profile]
+        client_id = self.frames.subscribe(remote, profile)
+        self.acquire()
+        seq = 0
 
-            if frame is None:
-                time.sleep(0.1)
-                continue
+        try:
+            while True:
+                new_seq, frame = self.frames.wait_next(seq, CLIENT_IDLE_WAKE)
+                if frame is None:
+                    continue
 
-            yield (
-                b"--frame\r\n"
-                b"Content-Type: image/jpeg\r\n\r\n"
-                + frame +
-                b"\r\n"
-            )
+                skipped = new_seq - seq - 1 if seq else 0
+                seq = new_seq
+                frame = encoder.get(seq, frame)
+
+                yield (
+                    b"--frame\r\n"
+                    b"Content-Type: image/jpeg\r\n\r\n"
+                    + frame +
+                    b"\r\n"
+                )
+
+                self.frames.record(client_id, len(frame), skipped)
+        finally:
+            self.frames.unsubscribe(client_id)
+            self.release()
+
+    def get_stats(self) -> dict:
+        now = time.time()
+        with self._lock:
+            connected = self._connected_total
+            if self._connected_since is not None:
+                connected += now - self._connected_since
+            uptime = now - self.started_at if self.started_at else None
 
-            time.sleep(0.03)
+            stats = {
+                "running": self._running,
+                "started_at": self.started_at,
+                "mode": self._mode,
+                "connected": self._connected_since is not None,
+                "viewers": self._viewers,
+                "connected_seconds": round(connected, 1),
+                "duty_cycle": round(connected / uptime, 3) if uptime else None,
+                "last_error": self._last_error,
+                **self._stats,
+            }
+        stats["profiles"] = {name: p.get_stats() for name, p in self._profiles.items()}
+        return {**stats, **self.frames.get_stats()}
 
     # -------------------------
     # Internal worker
     # -------------------------
 
     def _camera_worker(self):
-        """Background thread that keeps the camera alive."""
+        """Background thread: live while wanted, snapshots while idle."""
+        from bambulab import JPEGFrameStream
+
         stream = JPEGFrameStream(self.printer_ip, self.access_code)
+        last_snapshot = None
 
         while self._running:
-            try:
-                stream.connect()
+            self._wake.clear()
 
-                while self._running:
-                    frame = stream.get_frame()
-                    if frame:
-                        with self._lock:
-                            self._latest_frame = frame
-                    time.sleep(0.03)
+            if self._wanted():
+                self._set_mode("live")
+                if not self._session(stream, live=True):
+                    self._wake.wait(RETRY_DELAY)
+                # The live frame is as fresh as a snapshot would be
+                last_snapshot = time.time()
+                continue
 
-            except Exception as e:
-                # Swallow errors and retry
-                time.sleep(2)
+            # ---- Idle: one-frame sessions on schedule or for grab() ----
+            if not self._grab_pending():
+                if SNAPSHOT_INTERVAL <= 0:
+                    self._set_mode("idle")
+                    self._wake.wait()
+                    continue
 
-            finally:
-                try:
-                    stream.disconnect()
-                except Exception:
-                    pass
+                due = 0 if last_snapshot is None else last_snapshot + SNAPSHOT_INTERVAL - time.time()
+                if due > 0:
+                    self._set_mode("idle")
+                    self._wake.wait(due)
+                    continue
+
+            self._set_mode("snapshot")
+            last_snapshot = time.time()
+            if self._session(stream, live=False):
+                with self._lock:
+                    self._stats["snapshots"] += 1
+            else:
+                self._wake.wait(RETRY_DELAY)
+
+    def _grab_pending(self):
+        seq, _ = self.frames.latest()
+        with self._lock:
+            return self._grabs > 0 and seq <= self._grab_seq
+
+    def _wanted(self):
+        with self._lock:
+            if self._viewers > 0:
+                return True
+            return self._last_release is not None and time.time() - self._last_release < IDLE_GRACE
+
+    def _set_mode(self, mode):
+        with self._lock:
+            self._mode = mode
+
+    def _session(self, stream, live):
+        """One connection: frames until nobody wants them (live) or one frame."""
+        try:
+            stream.connect()
+            with self._lock:
+                self._stats["connects"] += 1
+                self._connected_since = time.time()
+
+            while self._running:
+                frame = stream.get_frame()
+                if frame:
+                    self.frames.publish(frame)
+                if not live or not self._wanted():
+                    break
+                time.sleep(0.03)
+            return True
+
+        except Exception as e:
+            # Swallow errors and retry
+            with self._lock:
+                self._stats["connect_errors"] += 1
+                self._last_error = str(e)
+            return False
+
+        finally:
+            try:
+                stream.disconnect()
+            except Exception:
+                pass
+
+            with self._lock:
+                if self._connected_since is not None:
+                    self._connected_total += time.time() - self._connected_since
+                    self._connected_since = None
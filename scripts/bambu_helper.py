@@ -45,8 +45,11 @@ def get_p1s_status():
 
     # ---------- Offline / not ready ----------
     if not isinstance(raw, dict) or not raw.get("connected"):
+        # Still authenticating / handshaking in the background
+        connecting = isinstance(raw, dict) and raw.get("readiness") == "connecting"
+
         return {
-            "state": "Offline",
+            "state": "Connecting" if connecting else "Offline",
             "progress": 0,
             "eta": "--",
 
@@ -0,0 +1,249 @@
+"""
+Bambu MQTT Session
+==================
+
+Pure helper module:
+- ONE managed MQTT connection to the Bambu cloud broker per process
+  (built on bambulab.MQTTClient)
+- Connects from a background thread with ONE attempt; retrying a failed
+  connect (and re-authenticating) is up to the owner (bambu_api), so
+  there is a single retry policy. Once connected, dropped connections
+  are re-established by paho between RECONNECT_MIN and RECONNECT_MAX
+- stop() always disconnects, even while a connect is still in progress
+- Keep-alive pushall and commands are published on the existing
+  connection (no throwaway clients, no extra TLS handshakes)
+- Connect / disconnect / message-rate / publish stats via get_stats()
+
+NO Flask code in here.
+"""
+
+import time
+import threading
+from collections import deque
+
+PUSHALL = {"pushing": {"command": "pushall"}}
+
+
+def _session_client_class():
+    # bambulab is imported on the session thread, not at module import
+    from bambulab import MQTTClient
+
+    class _SessionClient(MQTTClient):
+        """MQTTClient that reports connection events to its session."""
+
+        def __init__(self, session, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.session = session
+
+        def _on_connect(self, client, userdata, flags, rc, properties=None):
+            super()._on_connect(client, userdata, flags, rc, properties)
+            self.session._connected_event(rc)
+
+        def _on_disconnect(self, client, userdata, *args):
+            self.connected = False
+            self.session._disconnected_event()
+
+        def _on_message(self, client, userdata, msg, properties=None):
+            self.session._message_event()
+            super()._on_message(client, userdata, msg, properties)
+
+    return _SessionClient
+
+
+class BambuMQTTSession:
+    KEEPALIVE_INTERVAL = 180    # seconds between pushall requests
+    RECONNECT_MIN = 1           # seconds, paho doubles per failed reconnect
+    RECONNECT_MAX = 120
+    RATE_WINDOW = 60            # seconds of messages behind msg_rate
+
+    def __init__(self, uid: str, token: str, serial: str, on_message=None):
+        self.uid = uid
+        self.token = token
+        self.serial = serial
+        self.on_message = on_message
+
+        self._lock = threading.Lock()
+        self._connected = threading.Event()
+        self._failed = threading.Event()    # the connect attempt raised
+        self._stop = threading.Event()
+        self._thread = None
+        self._mqtt = None
+
+        self._recent = deque()      # message timestamps (RATE_WINDOW)
+        self._stats = {
+            "connect_attempts": 0,
+            "connects": 0,
+            "disconnects": 0,
+            "messages": 0,
+            "publishes": 0,
+            "publish_errors": 0,
+            "keepalives": 0,
+        }
+        self._connected_since = None
+        self._last_message = None
+        self._last_error = None
+
+    # -------------------------
+    # Public API
+    # -------------------------
+
+    def start(self):
+        """Connect + keep-alive on a background thread (safe to call once)."""
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(
+            target=self._session_worker,
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        # Same lock as the worker's hand-off: a connect still in progress
+        # sees _stop afterwards and disconnects its own client
+        with self._lock:
+            self._stop.set()
+            mqtt = self._mqtt
+        self._connected.clear()
+
+        if mqtt is not None:
+            try:
+                mqtt.disconnect()
+            except Exception:
+                pass
+
+    def wait_connected(self, timeout: float = None) -> bool:
+        """True once connected; False on timeout or a failed connect attempt."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._connected.wait(0.25):
+            if self._failed.is_set() or self._stop.is_set():
+                return False
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+        return True
+
+    def last_error(self):
+        with self._lock:
+            return self._last_error
+
+    def is_connected(self) -> bool:
+        return self._connected.is_set()
+
+    def publish(self, command: dict) -> bool:
+        """Publish on the live connection. False if not connected."""
+        mqtt = self._mqtt
+        if mqtt is None or not self._connected.is_set():
+            return False
+
+        try:
+            mqtt.publish(command)
+        except Exception as e:
+            with self._lock:
+                self._stats["publish_errors"] += 1
+                self._last_error = str(e)
+            return False
+
+        with self._lock:
+            self._stats["publishes"] += 1
+        return True
+
+    def request_pushall(self) -> bool:
+        return self.publish(PUSHALL)
+
+    def get_stats(self) -> dict:
+        now = time.time()
+        with self._lock:
+            self._trim_locked(now)
+            return {
+                "connected": self._connected.is_set(),
+                "connected_since": self._connected_since,
+                "uptime": round(now - self._connected_since, 1) if self._connected_since else None,
+                "msg_rate": round(len(self._recent) / self.RATE_WINDOW, 2),
+                "last_message": self._last_message,
+                "last_error": self._last_error,
+                **self._stats,
+            }
+
+    # -------------------------
+    # Internal
+    # -------------------------
+
+    def _session_worker(self):
+        client_class = _session_client_class()
+
+        # One connect attempt; the owner decides whether / when to retry
+        with self._lock:
+            self._stats["connect_attempts"] += 1
+
+        try:
+            mqtt = client_class(
+                self,
+                self.uid,
+                self.token,
+                self.serial,
+                on_message=self.on_message,
+            )
+            mqtt.connect(blocking=False)
+
+            # Later drops: paho reconnects on its own loop thread
+            mqtt.client.reconnect_delay_set(self.RECONNECT_MIN, self.RECONNECT_MAX)
+
+        except Exception as e:
+            with self._lock:
+                self._last_error = str(e)
+            self._failed.set()
+            print("Bambu MQTT connect failed:", e, flush=True)
+            return
+
+        with self._lock:
+            stopped = self._stop.is_set()
+            if not stopped:
+                self._mqtt = mqtt
+
+        if stopped:
+            # stop() ran while connect() was blocking: don't leak the loop
+            try:
+                mqtt.disconnect()
+            except Exception:
+                pass
+            return
+
+        # Keep-alive on the same connection
+        while not self._stop.wait(self.KEEPALIVE_INTERVAL):
+            if self.request_pushall():
+                with self._lock:
+                    self._stats["keepalives"] += 1
+
+    def _connected_event(self, rc):
+        if self._stop.is_set():
+            return
+
+        if rc != 0:
+            with self._lock:
+                self._last_error = f"connect refused ({rc})"
+            return
+
+        with self._lock:
+            self._stats["connects"] += 1
+            self._connected_since = time.time()
+        self._connected.set()
+
+    def _disconnected_event(self):
+        with self._lock:
+            if self._connected.is_set():
+                self._stats["disconnects"] += 1
+            self._connected_since = None
+        self._connected.clear()
+
+    def _message_event(self):
+        now = time.time()
+        with self._lock:
+            self._stats["messages"] += 1
+            self._last_message = now
+            self._recent.append(now)
+            self._trim_locked(now)
+
+    def _trim_locked(self, now):
+        cutoff = now - self.RATE_WINDOW
+        while self._recent and self._recent[0] < cutoff:
+            self._recent.popleft()
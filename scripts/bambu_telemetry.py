@@ -0,0 +1,378 @@
+"""
+Bambu Print Telemetry
+=====================
+
+Pure helper module:
+- Records per-job time series from the MQTT print state
+  (temperatures + targets, progress, layer, fan levels)
+- Fed by bambu_api listeners (observe() is called per merged message)
+- Jobs are segmented on gcode_state transitions (idle -> active starts
+  a job, FINISH / FAILED / IDLE ends it) and on task id changes
+- Compact storage: one array.array per series; when a job grows past
+  MAX_POINTS every other sample is dropped and the interval doubles
+- Persisted per job to data/p1s_history/<job>.json (base64 arrays),
+  written every SAVE_INTERVAL while recording and when a job ends;
+  an interrupted job resumes if the same task comes back after a restart
+- Job metadata is kept in memory and in a small jobs.idx file, so
+  listing jobs never parses the series; file writes and pruning run on
+  the saver thread, never on the MQTT callback
+
+NO Flask code in here.
+"""
+
+import re
+import json
+import time
+import array
+import atexit
+import base64
+import threading
+from pathlib import Path
+
+# series -> key in the MQTT "print" dict
+SERIES = {
+    "nozzle": "nozzle_temper",
+    "nozzle_target": "nozzle_target_temper",
+    "bed": "bed_temper",
+    "bed_target": "bed_target_temper",
+    "chamber": "chamber_temper",
+    "progress": "mc_percent",
+    "layer": "layer_num",
+    "fan_part": "cooling_fan_speed",
+    "fan_aux": "big_fan1_speed",
+    "fan_chamber": "big_fan2_speed",
+}
+
+ACTIVE_STATES = ("PREPARE", "RUNNING", "PAUSE", "PAUSED", "SLICING")
+END_STATES = ("FINISH", "FAILED", "IDLE")
+
+INTERVAL = 10.0         # seconds between recorded samples (doubles on decimation)
+MAX_POINTS = 4000       # per series, per job
+SAVE_INTERVAL = 60.0    # seconds between saves of the active job
+MAX_JOBS = 100          # job files kept on disk
+INDEX_NAME = "jobs.idx" # job metadata cache next to the job files
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii")
+
+
+def _num(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+class _Job:
+    """One print: sample offsets (s since start) + one float array per series."""
+
+    def __init__(self, key, task_id, name, started, interval=INTERVAL):
+        self.key = key
+        self.task_id = task_id
+        self.name = name
+        self.started = started
+        self.ended = None
+        self.result = None
+        self.total_layers = None
+        self.interval = interval
+
+        self.offsets = array.array("I")
+        self.series = {name: array.array("f") for name in SERIES}
+        self.last_sample = None
+
+    def add(self, p, ts):
+        self.offsets.append(max(0, int(ts - self.started)))
+        for name, key in SERIES.items():
+            self.series[name].append(_num(p.get(key)))
+        self.last_sample = ts
+
+        if len(self.offsets) > MAX_POINTS:
+            self._decimate()
+
+    def _decimate(self):
+        # Keep every other point (always the newest) and halve the rate
+        self.offsets = self.offsets[::-1][::2][::-1]
+        for name, values in self.series.items():
+            self.series[name] = values[::-1][::2][::-1]
+        self.interval *= 2
+
+    def meta(self):
+        return {
+            "job": self.key,
+            "task_id": self.task_id,
+            "name": self.name,
+            "started": self.started,
+            "ended": self.ended,
+            "result": self.result,
+            "total_layers": self.total_layers,
+            "interval": self.interval,
+            "points": len(self.offsets),
+        }
+
+    def dump(self):
+        return {
+            **self.meta(),
+            "offsets": _b64(self.offsets.tobytes()),
+            "series": {name: _b64(values.tobytes()) for name, values in self.series.items()},
+        }
+
+    @classmethod
+    def load(cls, payload):
+        job = cls(payload["job"], payload.get("task_id"), payload.get("name"),
+                  payload["started"], payload.get("interval", INTERVAL))
+        job.ended = payload.get("ended")
+        job.result = payload.get("result")
+        job.total_layers = payload.get("total_layers")
+
+        job.offsets.frombytes(base64.b64decode(payload["offsets"]))
+        saved = payload.get("series", {})
+        for name, values in job.series.items():
+            if name in saved:
+                values.frombytes(base64.b64decode(saved[name]))
+            # A series added since the file was written: pad so indexes line up
+            while len(values) < len(job.offsets):
+                values.append(float("nan"))
+
+        if job.offsets:
+            job.last_sample = job.started + job.offsets[-1]
+        return job
+
+
+class TelemetryRecorder:
+    def __init__(self, directory: Path, interval: float = INTERVAL):
+        self.directory = Path(directory)
+        self.interval = interval
+
+        self._lock = threading.Lock()
+        self._job = None            # active _Job
+        self._dirty = False
+        self._finished = []         # ended jobs the saver hasn't written yet
+        self._index = {}            # key -> meta of jobs on disk
+        self._wake = threading.Event()
+
+        self._running = False
+        self._thread = None
+
+    # -------------------------
+    # Public API
+    # -------------------------
+
+    def start(self):
+        """Resume an unfinished job and start the saver (safe to call once)."""
+        if self._running:
+            return
+
+        self._running = True
+        self._load_index()
+        self._resume_unfinished()
+
+        self._thread = threading.Thread(
+            target=self._save_worker,
+            daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.save)
+
+    def observe(self, p: dict, ts: float = None):
+        """Feed one merged print state (bambu_api listener)."""
+        ts = ts or time.time()
+        state = p.get("gcode_state")
+        task_id = str(p.get("task_id") or p.get("subtask_id") or "") or None
+
+        finished = None
+        with self._lock:
+            active = state in ACTIVE_STATES
+            job = self._job
+
+            # ---- Segmentation ----
+            if job is not None and (state in END_STATES or (
+                    active and task_id and job.task_id and task_id != job.task_id)):
+                job.ended = ts
+                job.result = state if state in END_STATES else "REPLACED"
+                finished = job
+                self._job = job = None
+
+            if job is None and active:
+                job = self._job = self._new_job(p, task_id, ts)
+
+            # ---- Downsampled recording ----
+            if job is not None:
+                if p.get("total_layer_num") is not None:
+                    job.total_layers = p.get("total_layer_num")
+                if not job.name and p.get("subtask_name"):
+                    job.name = p.get("subtask_name")
+
+                if job.last_sample is None or ts - job.last_sample >= job.interval:
+                    job.add(p, ts)
+                    self._dirty = True
+
+            if finished is not None:
+                self._finished.append(finished)
+
+        if finished is not None:
+            # Written by the saver thread, not on the MQTT callback
+            self._wake.set()
+
+    def current_job(self):
+        with self._lock:
+            return self._job.key if self._job else None
+
+    def list_jobs(self) -> list:
+        """Newest first: job metadata only (from memory, no file reads)."""
+        with self._lock:
+            jobs = dict(self._index)
+            for job in self._finished:
+                jobs[job.key] = job.meta()
+            if self._job is not None:
+                jobs[self._job.key] = self._job.meta()
+
+        return [jobs[key] for key in sorted(jobs, reverse=True)]
+
+    def get_job(self, key: str, series=None):
+        """{meta..., "ts": [...], "<series>": [...]} or None. key "current" = active job."""
+        with self._lock:
+            job = self._job
+            if job is not None and key in ("current", job.key):
+                return self._export(job, series)
+            for job in self._finished:
+                if job.key == key:
+                    return self._export(job, series)
+
+        if key == "current" or not self._valid_key(key):
+            return None
+
+        try:
+            job = _Job.load(json.loads((self.directory / f"{key}.json").read_text()))
+        except FileNotFoundError:
+            return None
+        return self._export(job, series)
+
+    def save(self):
+        """Write ended jobs and the active job (if it changed) now."""
+        with self._lock:
+            finished, self._finished = self._finished, []
+            job = self._job if self._dirty else None
+            self._dirty = False
+
+        for done in finished:
+            self._write(done)
+        if job is not None:
+            self._write(job)
+
+        if finished:
+            self._prune()
+        if finished or job is not None:
+            self._save_index()
+
+    # -------------------------
+    # Internal
+    # -------------------------
+
+    def _new_job(self, p, task_id, ts):
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(ts))
+        key = f"{stamp}_{task_id}" if task_id else stamp
+        print(f"Telemetry: job {key} started", flush=True)
+        return _Job(key, task_id, p.get("subtask_name"), ts, self.interval)
+
+    @staticmethod
+    def _valid_key(key):
+        return bool(re.fullmatch(r"[\w-]+", key))
+
+    @staticmethod
+    def _export(job, series):
+        names = [s for s in (series or SERIES) if s in job.series]
+        out = job.meta()
+        out["ts"] = [job.started + o for o in job.offsets]
+        for name in names:
+            out[name] = [None if v != v else round(v, 1) for v in job.series[name]]
+        return out
+
+    def _write(self, job):
+        # caller must NOT hold self._lock
+        with self._lock:
+            payload = json.dumps(job.dump(), separators=(",", ":"))
+            meta = job.meta()
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"{job.key}.json"
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(payload)
+            tmp.replace(path)
+        except Exception as e:
+            print("Telemetry save failed:", e, flush=True)
+            return
+
+        with self._lock:
+            self._index[job.key] = meta
+
+    def _prune(self):
+        files = sorted(self.directory.glob("*.json"))
+        for path in files[:-MAX_JOBS]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            with self._lock:
+                self._index.pop(path.stem, None)
+
+    def _load_index(self):
+        # jobs.idx is a cache: job files it doesn't know about are read once
+        try:
+            index = json.loads((self.directory / INDEX_NAME).read_text())
+        except (FileNotFoundError, ValueError):
+            index = {}
+
+        keys = {path.stem for path in self.directory.glob("*.json")}
+        index = {key: meta for key, meta in index.items() if key in keys}
+
+        for key in sorted(keys - index.keys()):
+            try:
+                payload = json.loads((self.directory / f"{key}.json").read_text())
+            except Exception:
+                continue
+            payload.pop("offsets", None)
+            payload.pop("series", None)
+            index[key] = payload
+
+        with self._lock:
+            self._index = index
+        self._save_index()
+
+    def _save_index(self):
+        with self._lock:
+            payload = json.dumps(self._index, separators=(",", ":"))
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / INDEX_NAME
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(payload)
+            tmp.replace(path)
+        except Exception as e:
+            print("Telemetry index save failed:", e, flush=True)
+
+    def _resume_unfinished(self):
+        # Newest job file without an end: keep appending if the task returns
+        with self._lock:
+            newest = max(self._index, default=None)
+            if newest is None or self._index[newest].get("ended") is not None:
+                return
+
+        try:
+            job = _Job.load(json.loads((self.directory / f"{newest}.json").read_text()))
+        except Exception as e:
+            print("Telemetry resume skipped:", e, flush=True)
+            return
+
+        with self._lock:
+            self._job = job
+        print(f"Telemetry: resumed job {job.key}", flush=True)
+
+    def _save_worker(self):
+        while self._running:
+            # Ended jobs wake the saver right away
+            self._wake.wait(SAVE_INTERVAL)
+            self._wake.clear()
+            self.save()
@@ -0,0 +1,205 @@
+"""
+Bambu Layer Timelapse
+=====================
+
+Pure helper module:
+- Saves one camera frame per layer change while a print is running
+- Fed by bambu_api listeners (observe() is called per merged message);
+  frames are filed under the telemetry job key, so a timelapse and its
+  /api/p1s/history entry share the same name
+- observe() only puts a small request on a bounded queue; a separate
+  worker grabs a fresh frame (connecting the camera if it is idle) and
+  writes it. A full queue drops the layer instead of blocking MQTT or
+  the camera worker
+- Frames are written to data/timelapse/<job>/<layer>.jpg; the newest
+  MAX_JOBS job directories are kept
+- on_job_end(job) runs on the capture worker once a finished job's
+  queued frames are on disk (video assembly hooks in here)
+
+NO Flask code in here.
+"""
+
+import re
+import time
+import queue
+import shutil
+import threading
+from pathlib import Path
+
+QUEUE_SIZE = 8          # pending layer captures before layers are dropped
+GRAB_TIMEOUT = 15.0     # seconds to wait for a fresh camera frame
+MAX_JOBS = 20           # job directories kept on disk
+
+
+class TimelapseRecorder:
+    def __init__(self, camera, directory: Path, job_key=None, on_job_end=None):
+        """
+        camera:     BambuMJPEGCamera (grab())
+        job_key:    callable -> active job key (TelemetryRecorder.current_job)
+        on_job_end: callable(job) after a recorded job's last frame is saved
+        """
+        self.camera = camera
+        self.directory = Path(directory)
+        self.job_key = job_key
+        self.on_job_end = on_job_end
+
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._job = None
+        self._layer = None
+        self._ended = []            # finished jobs waiting for on_job_end
+
+        self._running = False
+        self._thread = None
+
+        self._stats = {
+            "queued": 0,
+            "captured": 0,
+            "dropped": 0,
+            "errors": 0,
+        }
+        self._last_capture = None
+        self._last_error = None
+
+    # -------------------------
+    # Public API
+    # -------------------------
+
+    def start(self):
+        """Start the capture worker (safe to call once)."""
+        if self._running:
+            return
+
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._capture_worker,
+            daemon=True
+        )
+        self._thread.start()
+
+    def observe(self, p: dict, ts: float = None):
+        """Feed one merged print state (bambu_api listener)."""
+        job = self.job_key() if self.job_key else None
+        layer = p.get("layer_num")
+
+        with self._lock:
+            if job != self._job:
+                if self._job is not None and self._layer is not None:
+                    self._ended.append(self._job)
+                    self._wake_worker()
+                self._job, self._layer = job, None
+
+            if job is None or layer is None or layer == self._layer:
+                return
+            self._layer = layer
+
+        try:
+            self._queue.put_nowait((job, int(layer), ts or time.time()))
+        except (queue.Full, TypeError, ValueError):
+            with self._lock:
+                self._stats["dropped"] += 1
+            return
+
+        with self._lock:
+            self._stats["queued"] += 1
+
+    def list_jobs(self) -> list:
+        """Newest first: job key, frame count, first / last layer."""
+        if not self.directory.exists():
+            return []
+
+        jobs = []
+        for path in sorted((p for p in self.directory.iterdir() if p.is_dir()), reverse=True):
+            layers = sorted(int(f.stem) for f in path.glob("*.jpg"))
+            jobs.append({
+                "job": path.name,
+                "frames": len(layers),
+                "first_layer": layers[0] if layers else None,
+                "last_layer": layers[-1] if layers else None,
+            })
+        return jobs
+
+    def frame_paths(self, key: str) -> list:
+        """A job's frame files in layer order ([] for unknown jobs)."""
+        if not self._valid_key(key):
+            return []
+        return sorted((self.directory / key).glob("*.jpg"), key=lambda f: int(f.stem))
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self._running,
+                "job": self._job,
+                "layer": self._layer,
+                "pending": self._queue.qsize(),
+                "last_capture": self._last_capture,
+                "last_error": self._last_error,
+                **self._stats,
+            }
+
+    # -------------------------
+    # Internal
+    # -------------------------
+
+    @staticmethod
+    def _valid_key(key):
+        return bool(re.fullmatch(r"[\w-]+", key))
+
+    def _wake_worker(self):
+        # A full queue wakes the worker anyway
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+    def _capture_worker(self):
+        while self._running:
+            item = self._queue.get()
+
+            if item is not None:
+                self._capture(*item)
+
+            # Jobs end only after their queued frames are written
+            if self._queue.empty():
+                with self._lock:
+                    ended, self._ended = self._ended, []
+                for job in ended:
+                    if self.on_job_end is not None:
+                        try:
+                            self.on_job_end(job)
+                        except Exception as e:
+                            print(f"Timelapse job end hook failed ({job}):", e, flush=True)
+
+    def _capture(self, job, layer, ts):
+        try:
+            frame = self.camera.grab(GRAB_TIMEOUT)
+            if frame is None:
+                raise TimeoutError(f"no camera frame within {GRAB_TIMEOUT}s")
+
+            job_dir = self.directory / job
+            new_job = not job_dir.exists()
+            job_dir.mkdir(parents=True, exist_ok=True)
+
+            path = job_dir / f"{layer:05d}.jpg"
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(frame)
+            tmp.replace(path)
+
+            with self._lock:
+                self._stats["captured"] += 1
+                self._last_capture = {"job": job, "layer": layer, "ts": ts}
+
+            if new_job:
+                print(f"Timelapse: recording job {job}", flush=True)
+                self._prune()
+
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+                self._last_error = str(e)
+            print(f"Timelapse layer {layer} skipped:", e, flush=True)
+
+    def _prune(self):
+        dirs = sorted(p for p in self.directory.iterdir() if p.is_dir())
+        for path in dirs[:-MAX_JOBS]:
+            shutil.rmtree(path, ignore_errors=True)
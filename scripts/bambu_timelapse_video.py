@@ -0,0 +1,313 @@
+"""
+Bambu Timelapse Video
+=====================
+
+Pure helper module:
+- Turns a job's layer frames (data/timelapse/<job>/*.jpg) into one video
+  (data/timelapse_video/<job>.mp4, MJPG .avi if mp4v is unavailable)
+- Streams frames from disk through cv2.VideoWriter one at a time: only
+  the frame being encoded is ever in memory
+- Runs on one background worker at a lowered OS priority (nice) with a
+  single OpenCV thread, so encoding doesn't starve Flask on the Pi
+- Resumable: frames are encoded in SEGMENT_FRAMES chunks under
+  <job>.parts/, progress.json records finished segments, and unfinished
+  jobs are re-queued on start(). VideoWriter cannot append to a file, so
+  jobs longer than one segment are joined in a final streaming pass
+  (segment videos -> output). That pass decodes and re-encodes every
+  frame a second time: about double the CPU, plus one more generation of
+  lossy compression. SEGMENT_FRAMES is sized so that typical prints fit
+  in one segment, which is simply renamed into place
+- The newest MAX_JOBS videos are kept (same cap as the frame directories)
+
+NO Flask code in here.
+"""
+
+import os
+import re
+import json
+import time
+import queue
+import shutil
+import threading
+from pathlib import Path
+
+from scripts.bambu_timelapse import MAX_JOBS
+
+FPS = 30                # output frame rate
+SEGMENT_FRAMES = 600    # frames (layers) per resumable segment
+NICE = 10               # added to the worker thread's current nice value
+FRAME_PAUSE = 0.005     # seconds yielded between frames
+
+# (fourcc, extension), first that opens wins
+CODECS = (("mp4v", ".mp4"), ("MJPG", ".avi"))
+
+
+class TimelapseAssembler:
+    def __init__(self, frames_dir: Path, directory: Path):
+        self.frames_dir = Path(frames_dir)
+        self.directory = Path(directory)
+
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._jobs = {}             # job -> status dict (this process)
+
+        self._running = False
+        self._thread = None
+
+    # -------------------------
+    # Public API
+    # -------------------------
+
+    def start(self):
+        """Start the worker and resume interrupted jobs (safe to call once)."""
+        if self._running:
+            return
+
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._assemble_worker,
+            daemon=True
+        )
+        self._thread.start()
+
+        if self.directory.exists():
+            for parts in sorted(self.directory.glob("*.parts")):
+                if self.request(parts.stem) is None:
+                    # Frames were pruned meanwhile: nothing left to resume
+                    shutil.rmtree(parts, ignore_errors=True)
+                    continue
+                print(f"Timelapse video: resuming {parts.stem}", flush=True)
+
+    def request(self, job: str) -> dict:
+        """Queue assembly of `job`; returns its status (None = no frames)."""
+        if not self._valid_key(job) or not any((self.frames_dir / job).glob("*.jpg")):
+            return None
+
+        with self._lock:
+            status = self._jobs.get(job)
+            if status is not None and status["state"] in ("queued", "encoding"):
+                return dict(status)
+
+            status = self._jobs[job] = self._new_status(job)
+        self._queue.put(job)
+        return dict(status)
+
+    def get_status(self, job: str) -> dict:
+        """In-process status, else "done" / "none" from what is on disk."""
+        with self._lock:
+            status = self._jobs.get(job)
+            if status is not None:
+                return {**status, **self._output_info(job)}
+
+        if not self._valid_key(job):
+            return None
+        state = "done" if self.video_path(job) else "none"
+        return {"job": job, "state": state, **self._output_info(job)}
+
+    def list_videos(self) -> list:
+        return [self.get_status(path.stem) for path in sorted(self._outputs(), reverse=True)]
+
+    def video_path(self, job: str):
+        """Finished video file for `job`, or None."""
+        if not self._valid_key(job):
+            return None
+        for _, ext in CODECS:
+            path = self.directory / f"{job}{ext}"
+            if path.exists():
+                return path
+        return None
+
+    # -------------------------
+    # Internal
+    # -------------------------
+
+    @staticmethod
+    def _valid_key(key):
+        return bool(re.fullmatch(r"[\w-]+", key))
+
+    def _outputs(self):
+        if not self.directory.exists():
+            return []
+        return [p for p in self.directory.iterdir() if p.suffix in {ext for _, ext in CODECS}]
+
+    def _prune(self):
+        # Job keys start with the print's start time: oldest sort first
+        for path in sorted(self._outputs())[:-MAX_JOBS]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            with self._lock:
+                self._jobs.pop(path.stem, None)
+
+    def _output_info(self, job):
+        path = self.video_path(job)
+        return {"file": path.name if path else None, "bytes": path.stat().st_size if path else None}
+
+    @staticmethod
+    def _new_status(job):
+        return {
+            "job": job,
+            "state": "queued",
+            "frames_done": 0,
+            "frames_total": None,
+            "segments_done": 0,
+            "segments_total": None,
+            "requested": time.time(),
+            "finished": None,
+            "error": None,
+        }
+
+    def _update(self, job, **fields):
+        # _prune() may have dropped the status of a queued job: start afresh
+        with self._lock:
+            self._jobs.setdefault(job, self._new_status(job)).update(fields)
+
+    def _assemble_worker(self):
+        try:
+            # Linux nice is per thread: only this worker is deprioritised
+            tid = threading.get_native_id()
+            os.setpriority(os.PRIO_PROCESS, tid, os.getpriority(os.PRIO_PROCESS, tid) + NICE)
+        except (AttributeError, OSError) as e:
+            print("Timelapse video: could not lower priority:", e, flush=True)
+
+        while self._running:
+            job = self._queue.get()
+            started = time.time()
+            self._update(job, state="encoding", error=None)
+
+            try:
+                self._assemble(job)
+            except Exception as e:
+                self._update(job, state="error", error=str(e), finished=time.time())
+                print(f"Timelapse video {job} failed:", e, flush=True)
+                continue
+
+            self._update(job, state="done", finished=time.time())
+            print(f"Timelapse video {job} done ({time.time() - started:.0f}s)", flush=True)
+            self._prune()
+
+    def _assemble(self, job):
+        import cv2     # heavy: imported on the worker, on first use
+        cv2.setNumThreads(1)
+
+        frames = sorted((self.frames_dir / job).glob("*.jpg"), key=lambda f: int(f.stem))
+        if not frames:
+            raise FileNotFoundError(f"no frames for {job}")
+
+        parts = self.directory / f"{job}.parts"
+        parts.mkdir(parents=True, exist_ok=True)
+        progress = self._load_progress(parts)
+
+        # Frame size + codec are fixed by the first segment ever written
+        if progress is None:
+            first = cv2.imread(str(frames[0]))
+            if first is None:
+                raise ValueError(f"unreadable frame {frames[0].name}")
+            height, width = first.shape[:2]
+            fourcc, ext = self._pick_codec(cv2, parts, (width, height))
+            progress = {"size": [width, height], "fourcc": fourcc, "ext": ext, "segments": 0}
+            self._save_progress(parts, progress)
+
+        size = tuple(progress["size"])
+        ext = progress["ext"]
+        segments = [frames[i:i + SEGMENT_FRAMES] for i in range(0, len(frames), SEGMENT_FRAMES)]
+        done = min(progress["segments"], len(segments))
+        self._update(
+            job,
+            frames_total=len(frames),
+            frames_done=min(done * SEGMENT_FRAMES, len(frames)),
+            segments_total=len(segments),
+            segments_done=done,
+        )
+
+        # ---- Segments: JPEG files -> segment videos ----
+        for index in range(done, len(segments)):
+            path = parts / f"seg_{index:04d}{ext}"
+            writer = self._open_writer(cv2, path, progress["fourcc"], size)
+            try:
+                for frame_path in segments[index]:
+                    img = cv2.imread(str(frame_path))
+                    if img is None:
+                        continue
+                    if (img.shape[1], img.shape[0]) != size:
+                        img = cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+                    writer.write(img)
+                    del img
+
+                    with self._lock:
+                        self._jobs.setdefault(job, self._new_status(job))["frames_done"] += 1
+                    time.sleep(FRAME_PAUSE)
+            finally:
+                writer.release()
+
+            progress["segments"] = index + 1
+            self._save_progress(parts, progress)
+            self._update(job, segments_done=index + 1)
+
+        # ---- Output: one segment is renamed, several are joined ----
+        output = self.directory / f"{job}{ext}"
+        seg_paths = [parts / f"seg_{i:04d}{ext}" for i in range(len(segments))]
+
+        if len(seg_paths) == 1:
+            # Missing segment + existing output: a previous run already
+            # renamed it and died before removing .parts
+            if seg_paths[0].exists() or not output.exists():
+                seg_paths[0].replace(output)
+        else:
+            tmp = parts / f"joined{ext}"
+            writer = self._open_writer(cv2, tmp, progress["fourcc"], size)
+            try:
+                for seg_path in seg_paths:
+                    capture = cv2.VideoCapture(str(seg_path))
+                    try:
+                        while True:
+                            ok, img = capture.read()
+                            if not ok:
+                                break
+                            writer.write(img)
+                            time.sleep(FRAME_PAUSE)
+                    finally:
+                        capture.release()
+            finally:
+                writer.release()
+            tmp.replace(output)
+
+        # A stale video in the other container would shadow this one
+        for _, other in CODECS:
+            if other != ext:
+                (self.directory / f"{job}{other}").unlink(missing_ok=True)
+        shutil.rmtree(parts, ignore_errors=True)
+
+    @staticmethod
+    def _open_writer(cv2, path, fourcc, size):
+        writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*fourcc), FPS, size)
+        if not writer.isOpened():
+            raise RuntimeError(f"VideoWriter could not open {fourcc} for {path.name}")
+        return writer
+
+    @staticmethod
+    def _pick_codec(cv2, parts, size):
+        for fourcc, ext in CODECS:
+            probe = parts / f"probe{ext}"
+            writer = cv2.VideoWriter(str(probe), cv2.VideoWriter_fourcc(*fourcc), FPS, size)
+            opened = writer.isOpened()
+            writer.release()
+            probe.unlink(missing_ok=True)
+            if opened:
+                return fourcc, ext
+        raise RuntimeError("no usable video codec (tried " + ", ".join(c for c, _ in CODECS) + ")")
+
+    @staticmethod
+    def _load_progress(parts):
+        try:
+            return json.loads((parts / "progress.json").read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    @staticmethod
+    def _save_progress(parts, progress):
+        path = parts / "progress.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(progress))
+        tmp.replace(path)
@@ -1,5 +1,4 @@
 import os
-import discord
 from collections import deque
 
 TEXT_BUFFER_SIZE = 25
@@ -9,19 +8,29 @@ text_buffers = {}  # {channel_name: deque([...])}
 # ---- Global state Flask will read ----
 discord_ready = False
 
-# ---- Intents (what data Discord will send us) ----
-intents = discord.Intents.default()
-intents.guilds = True
-intents.voice_states = True
-intents.members = True
-intents.presences = True
-intents.messages = True
-intents.message_content = True
+# ---- Shared Discord client (built by run_forever) ----
+# discord.py is only imported when the bot actually starts
+client = None
+
+
+def _build_client():
+    import discord
+
+    # ---- Intents (what data Discord will send us) ----
+    intents = discord.Intents.default()
+    intents.guilds = True
+    intents.voice_states = True
+    intents.members = True
+    intents.presences = True
+    intents.messages = True
+    intents.message_content = True
+
+    bot = discord.Client(intents=intents)
+    bot.event(on_message)
+    bot.event(on_ready)
+    return bot
 
-# ---- Shared Discord client ----
-client = discord.Client(intents=intents)
 
-@client.event
 async def on_message(message):
     if message.author.bot:
         return
@@ -50,7 +59,6 @@ async def on_message(message):
         flush=True
     )
 
-@client.event
 async def on_ready():
     global discord_ready
     discord_ready = True
@@ -116,6 +124,11 @@ def get_voice_snapshot():
     """
     out = {}
 
+    if client is None:
+        return out
+
+    import discord
+
     for guild in client.guilds:
         channels = {}
 
@@ -166,12 +179,32 @@ def run_forever():
     """
     Run the Discord client forever (called from Flask thread).
     """
+    global client
+
     token = os.getenv("DISCORD_BOT_TOKEN")
     if not token:
         raise RuntimeError("DISCORD_BOT_TOKEN not found in environment")
 
+    client = _build_client()
     client.run(token)
 
 def get_text_snapshot(channel_name, limit=10):
     buf = text_buffers.get(channel_name, [])
     return list(buf)[-limit:]
+
+
+def get_text_heads():
+    """
+    Lightweight change marker per text channel:
+    { channel_name: {"count": int, "last": iso timestamp | None} }
+    """
+    heads = {}
+
+    for name, buf in list(text_buffers.items()):
+        last = buf[-1] if buf else None
+        heads[name] = {
+            "count": len(buf),
+            "last": last["timestamp"] if last else None,
+        }
+
+    return heads
@@ -0,0 +1,199 @@
+"""
+Event Hub
+=========
+
+Pure helper module:
+- Keeps the latest payload for each topic (lights, printer, discord, ...)
+- Stamps every real change with a monotonically increasing version
+- Polls registered sources in the background, but only while someone listens
+- Exposes a Server-Sent Events generator for /api/events
+
+publish() compares against the last payload, so callers can publish as
+often as they like — subscribers only wake up when something changed.
+
+NO Flask code in here.
+"""
+
+import json
+import time
+import threading
+
+KEEPALIVE_SECONDS = 15   # comment line so proxies / dead sockets get noticed
+RETRY_MS = 3000          # EventSource reconnect delay hint
+
+_cond = threading.Condition()
+_listening = threading.Event()
+
+# Seeded from the clock so versions keep increasing across Flask restarts.
+# A browser reconnecting with an old Last-Event-ID then gets a full resync.
+_version = int(time.time() * 1000)
+
+_topics = {}        # topic -> {"version", "data", "ts", "fingerprint"}
+_sources = {}       # topic -> {"fn", "interval", "thread"}
+_subscribers = 0
+
+
+# -------------------------
+# Publishing
+# -------------------------
+
+def _fingerprint(data):
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def publish(topic: str, data) -> bool:
+    """
+    Store a new payload for a topic.
+    Returns True if it differed from the previous one (and was broadcast).
+    """
+    global _version
+
+    fingerprint = _fingerprint(data)
+
+    with _cond:
+        current = _topics.get(topic)
+        if current is not None and current["fingerprint"] == fingerprint:
+            return False
+
+        _version += 1
+        _topics[topic] = {
+            "version": _version,
+            "data": data,
+            "ts": time.time(),
+            "fingerprint": fingerprint,
+        }
+        _cond.notify_all()
+
+    return True
+
+
+def get_topic(topic: str):
+    """Return the latest payload for a topic (or None)."""
+    with _cond:
+        entry = _topics.get(topic)
+        return entry["data"] if entry else None
+
+
+def changes_since(version: int):
+    """Return [(version, topic, data)] for every topic newer than version."""
+    with _cond:
+        return _changes_since_locked(version)
+
+
+def _changes_since_locked(version):
+    return sorted(
+        (entry["version"], topic, entry["data"])
+        for topic, entry in _topics.items()
+        if entry["version"] > version
+    )
+
+
+# -------------------------
+# Sources (polled producers)
+# -------------------------
+
+def register_source(topic: str, fn, interval: float = 2.0):
+    """
+    Poll fn() every `interval` seconds and publish the result under topic.
+    Sources sleep while nobody is subscribed to /api/events.
+    Safe to call once per topic.
+    """
+    if topic in _sources:
+        return
+
+    t = threading.Thread(
+        target=_source_loop,
+        args=(topic, fn, interval),
+        daemon=True,
+    )
+    _sources[topic] = {"fn": fn, "interval": interval, "thread": t}
+    t.start()
+
+
+def _source_loop(topic, fn, interval):
+    while True:
+        _listening.wait()
+
+        try:
+            publish(topic, fn())
+        except Exception as e:
+            print(f"Event source '{topic}' failed:", e, flush=True)
+
+        time.sleep(interval)
+
+
+# -------------------------
+# SSE stream
+# -------------------------
+
+def _format(version, topic, data):
+    return (
+        f"id: {version}\n"
+        f"event: {topic}\n"
+        f"data: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+    )
+
+
+def stream(last_event_id=None):
+    """
+    Generator yielding SSE frames.
+    Starts with every topic newer than last_event_id (all of them on a
+    fresh connection), then blocks until the next change.
+    """
+    global _subscribers
+
+    try:
+        last = int(last_event_id or 0)
+    except (TypeError, ValueError):
+        last = 0
+
+    with _cond:
+        if last > _version:
+            last = 0
+        _subscribers += 1
+        _listening.set()
+
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+
+        while True:
+            with _cond:
+                changed = _cond.wait_for(
+                    lambda: _version > last,
+                    timeout=KEEPALIVE_SECONDS,
+                )
+                events = _changes_since_locked(last)
+                if not events:
+                    # Nothing newer exists (e.g. fresh hub, no topics yet)
+                    last = _version
+
+            if not changed:
+                yield ": keep-alive\n\n"
+                continue
+
+            for version, topic, data in events:
+                yield _format(version, topic, data)
+                last = version
+
+    finally:
+        with _cond:
+            _subscribers -= 1
+            if _subscribers <= 0:
+                _subscribers = 0
+                _listening.clear()
+
+
+def get_stats():
+    with _cond:
+        return {
+            "version": _version,
+            "subscribers": _subscribers,
+            "topics": {
+                topic: {"version": e["version"], "ts": e["ts"]}
+                for topic, e in _topics.items()
+            },
+            "sources": {
+                topic: {"interval": s["interval"]}
+                for topic, s in _sources.items()
+            },
+        }
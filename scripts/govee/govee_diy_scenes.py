@@ -1,75 +0,0 @@
-"""
-Govee DIY scenes (custom user-created) exported from your account.
-Generated by govee-python-sdk.
-
-⚠️  WARNING: DO NOT EDIT THIS FILE!
-This file is automatically regenerated on each fetch and any manual changes will be lost.
-To add custom scene aliases, edit govee_diy_scene_aliases.py instead.
-
-DIY scenes use SKU_ID naming for stability:
-    from .govee_diy_scenes import H7050_18160460
-
-Use aliases for friendly names:
-    from govee_diy_scene_aliases import my_custom_scene
-"""
-from govee.models import DIYScene
-
-
-H6061_13222011 = DIYScene(
-    id=13222011,
-    name="Lighting Bot–Generated",
-    sku="H6061",
-    metadata={}
-)
-
-H6061_16519117 = DIYScene(
-    id=16519117,
-    name="Beehive Flicker",
-    sku="H6061",
-    metadata={}
-)
-
-H6061_16793137 = DIYScene(
-    id=16793137,
-    name="fairy color spin",
-    sku="H6061",
-    metadata={}
-)
-
-H6061_16793146 = DIYScene(
-    id=16793146,
-    name="fairy color flow",
-    sku="H6061",
-    metadata={}
-)
-
-H6061_21407320 = DIYScene(
-    id=21407320,
-    name="rainbow test",
-    sku="H6061",
-    metadata={}
-)
-
-H6061_21512828 = DIYScene(
-    id=21512828,
-    name="BeeOutline",
-    sku="H6061",
-    metadata={}
-)
-
-H6061_21512838 = DIYScene(
-    id=21512838,
-    name="pink Blend",
-    sku="H6061",
-    metadata={}
-)
-
-__all__ = [
-    "H6061_13222011",
-    "H6061_16519117",
-    "H6061_16793137",
-    "H6061_16793146",
-    "H6061_21407320",
-    "H6061_21512828",
-    "H6061_21512838",
-]
\ No newline at end of file
@@ -0,0 +1,305 @@
+"""
+Scene Catalog
+=============
+
+Pure helper module:
+- Reads the data-only scene catalog (scripts/govee/catalog/<SKU>_<ID>.json,
+  one file per device, written by refresh_diy_scenes.py)
+- Parses it lazily into lightweight records — no generated Python is
+  imported or reloaded, so a new sync takes effect with a file parse
+- Builds ONE key / id / name index and rebuilds it only when a catalog
+  file's mtime changes or a refresh finishes (invalidate())
+- Stamps each build with an ETag so clients can skip unchanged catalogs
+- write_catalog() is the single writer (atomic replace)
+
+govee SDK objects (Device / DIYScene / Scene) are only created when a
+scene is actually applied.
+
+NO Flask code in here.
+"""
+
+import re
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from collections import namedtuple
+
+BASE = Path(__file__).parent
+CATALOG_DIR = BASE / "catalog"
+
+CATALOG_VERSION = 1
+CHECK_INTERVAL = 2.0    # seconds between mtime checks
+
+# kind: "diy" | "scene" | "music"
+SceneRecord = namedtuple("SceneRecord", "key id name sku kind value")
+DeviceRecord = namedtuple("DeviceRecord", "key id name sku")
+
+
+def device_key(sku, device_id):
+    # "H6061" + "71:22:D0:05:C1:06:1F:48" -> "H6061_7122D005C1061F48"
+    return f"{sku}_{str(device_id).replace(':', '').upper()}"
+
+
+def scene_key(name, sku):
+    # Same naming the old generated modules used: "Awaken A" -> "awaken_a_h6061"
+    base = re.sub(r"[^\w\s-]", "", name)
+    base = re.sub(r"[-\s]+", "_", base).lower().strip("_")
+    if base and base[0].isdigit():
+        base = f"device_{base}"
+    base = base or "unnamed_device"
+    return f"{base}_{sku.lower()}" if sku else base
+
+
+# ==================================================
+# Catalog writer (refresh pipeline)
+# ==================================================
+def write_catalog(device, diy_scenes, scenes=None, music_modes=None,
+                  diy_scene_ids=None, directory: Path = CATALOG_DIR,
+                  previous: Path = None) -> Path:
+    """
+    Write one device's catalog. device/scenes may be SDK objects or dicts.
+    Built-in scenes / music modes / aliases that were not re-fetched are
+    carried over from `previous` (default: the file being replaced).
+    """
+    def field(obj, name, default=None):
+        if isinstance(obj, dict):
+            return obj.get(name, default)
+        return getattr(obj, name, default)
+
+    sku = field(device, "sku")
+    key = device_key(sku, field(device, "id"))
+    path = Path(directory) / f"{key}.json"
+
+    try:
+        previous = json.loads(Path(previous or path).read_text())
+    except Exception:
+        previous = {}
+
+    payload = {
+        "version": CATALOG_VERSION,
+        "generated": time.time(),
+        "device": {
+            "key": key,
+            "id": field(device, "id"),
+            "name": field(device, "name"),
+            "sku": sku,
+        },
+        "diy_scenes": sorted(
+            (
+                {
+                    "key": f"{field(s, 'sku') or sku}_{field(s, 'id')}",
+                    "id": field(s, "id"),
+                    "name": field(s, "name"),
+                }
+                for s in diy_scenes
+            ),
+            key=lambda s: s["key"],
+        ),
+        "scenes": previous.get("scenes", []) if scenes is None else sorted(
+            (
+                {
+                    "key": scene_key(field(s, "name"), sku),
+                    "name": field(s, "name"),
+                    "value": field(s, "value"),
+                }
+                for s in scenes
+            ),
+            key=lambda s: s["key"],
+        ),
+        "music_modes": previous.get("music_modes", []) if music_modes is None else sorted(
+            (
+                {
+                    "key": scene_key(field(m, "name"), sku),
+                    "name": field(m, "name"),
+                    "value": field(m, "value"),
+                }
+                for m in music_modes
+            ),
+            key=lambda m: m["key"],
+        ),
+        "diy_scene_ids": sorted(set(diy_scene_ids or [])),
+        # Hand-edited friendly names (key -> name), kept across syncs
+        "aliases": previous.get("aliases", {}),
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+    tmp.replace(path)
+    return path
+
+
+# ==================================================
+# Catalog reader / index
+# ==================================================
+class SceneCatalog:
+    def __init__(self, directory: Path = CATALOG_DIR):
+        self.directory = Path(directory)
+
+        self._lock = threading.Lock()
+        self._signature = None
+        self._checked = 0.0
+        self._index = None
+        self._records = {}      # key -> SceneRecord
+        self._devices = {}      # key -> DeviceRecord
+        self._builds = 0
+
+    # -------------------------
+    # Public API
+    # -------------------------
+
+    def index(self) -> dict:
+        """
+        {"etag", "built", "user_scenes", "diy_scenes", "govee_scenes", "music_modes"}
+        user_scenes: every DIY scene (scenes page)
+        diy_scenes:  DIY scenes the device reports as selectable (API)
+        """
+        with self._lock:
+            self._refresh_locked()
+            return self._index
+
+    @property
+    def etag(self) -> str:
+        return self.index()["etag"]
+
+    def get(self, key):
+        """SceneRecord for a key (None if unknown)."""
+        with self._lock:
+            self._refresh_locked()
+            return self._records.get(key)
+
+    def get_diy(self, key):
+        record = self.get(key)
+        return record if record is not None and record.kind == "diy" else None
+
+    def get_device(self, sku=None):
+        """First DeviceRecord (optionally for a SKU), or None."""
+        with self._lock:
+            self._refresh_locked()
+            for record in self._devices.values():
+                if sku is None or record.sku == sku:
+                    return record
+            return None
+
+    def invalidate(self):
+        """Force a rebuild on next access (called when a refresh finishes)."""
+        with self._lock:
+            self._signature = None
+            self._checked = 0.0
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "builds": self._builds,
+                "files": len(self._signature or ()),
+                "etag": self._index["etag"] if self._index else None,
+                "built": self._index["built"] if self._index else None,
+            }
+
+    # -------------------------
+    # Internal
+    # -------------------------
+
+    def _current_signature(self):
+        sig = []
+        for path in sorted(self.directory.glob("*.json")):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            sig.append((path.name, st.st_mtime_ns, st.st_size))
+        return tuple(sig)
+
+    def _refresh_locked(self):
+        now = time.monotonic()
+        if self._index is not None and now - self._checked < CHECK_INTERVAL:
+            return
+        self._checked = now
+
+        signature = self._current_signature()
+        if self._index is not None and signature == self._signature:
+            return
+
+        try:
+            self._index, self._records, self._devices = self._build(signature)
+            self._signature = signature
+            self._builds += 1
+        except Exception as e:
+            print("Scene catalog build failed:", e, flush=True)
+            if self._index is None:
+                self._index, self._records, self._devices = self._finish([], [], [], []), {}, {}
+
+    def _build(self, signature):
+        records = {}
+        devices = {}
+        user_scenes, diy_scenes, govee_scenes, music_modes = [], [], [], []
+
+        for name, _, _ in signature:
+            data = json.loads((self.directory / name).read_text())
+            if data.get("version") != CATALOG_VERSION:
+                print(f"Scene catalog {name}: unsupported version, skipped", flush=True)
+                continue
+
+            dev = data["device"]
+            sku = dev.get("sku")
+            devices[dev["key"]] = DeviceRecord(dev["key"], dev.get("id"), dev.get("name"), sku)
+
+            aliases = data.get("aliases", {})
+            diy_ids = set(data.get("diy_scene_ids", []))
+
+            for s in data.get("diy_scenes", []):
+                rec = SceneRecord(s["key"], s["id"], aliases.get(s["key"], s["name"]), sku, "diy", None)
+                records[rec.key] = rec
+                entry = {"key": rec.key, "name": rec.name}
+                user_scenes.append(entry)
+                if rec.id in diy_ids:
+                    diy_scenes.append(entry)
+
+            for s in data.get("scenes", []):
+                rec = SceneRecord(s["key"], None, aliases.get(s["key"], s["name"]), sku, "scene", s.get("value"))
+                records[rec.key] = rec
+                govee_scenes.append({"key": rec.key, "name": rec.name})
+
+            for m in data.get("music_modes", []):
+                rec = SceneRecord(m["key"], None, m["name"], sku, "music", m.get("value"))
+                records[rec.key] = rec
+                music_modes.append({"key": rec.key, "name": rec.name})
+
+        return self._finish(user_scenes, diy_scenes, govee_scenes, music_modes), records, devices
+
+    def _finish(self, user_scenes, diy_scenes, govee_scenes, music_modes):
+        body = {
+            "user_scenes": user_scenes,
+            "diy_scenes": diy_scenes,
+            "govee_scenes": govee_scenes,
+            "music_modes": music_modes,
+        }
+        digest = hashlib.sha1(
+            json.dumps(body, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        ).hexdigest()[:16]
+
+        return {"etag": digest, "built": time.time(), **body}
+
+
+# ==================================================
+# SDK objects (created only when applying)
+# ==================================================
+def to_sdk_scene(record: SceneRecord):
+    from govee.models import DIYScene, Scene, MusicMode
+
+    if record.kind == "diy":
+        return DIYScene(id=record.id, name=record.name, sku=record.sku)
+    if record.kind == "music":
+        return MusicMode(name=record.name, value=record.value, sku=record.sku)
+    return Scene(name=record.name, value=record.value, sku=record.sku)
+
+
+def to_sdk_device(record: DeviceRecord):
+    from govee.models import Device
+
+    return Device(id=record.id, name=record.name, sku=record.sku)
+
+
+catalog = SceneCatalog()
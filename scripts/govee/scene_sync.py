@@ -0,0 +1,279 @@
+"""
+Scene Sync
+==========
+
+Pure helper module:
+- Refreshes the Govee scene catalog IN-PROCESS on one worker thread
+  (no subprocess, no re-importing the SDK, no generated code)
+- Incremental: one device-list call, then one DIY-scene call per
+  scene-capable device; results are diffed against the stored catalog
+  and only changed devices are rewritten
+- Changed catalog files are staged first and swapped in with os.replace
+  at the end, then the in-memory index is rebuilt once
+- Progress, counters and per-phase timings via get_status()
+  (also pushed to the event hub as "scene_sync")
+
+Built-in scenes and music modes are not fetched here; write_catalog()
+carries them over from the previous file.
+
+NO Flask code in here.
+"""
+
+import json
+import time
+import threading
+
+from scripts import event_hub
+from scripts.govee.scene_catalog import (
+    CATALOG_DIR,
+    catalog as scene_catalog,
+    device_key,
+    write_catalog,
+)
+
+LOG_LINES = 50
+STAGING_DIR = CATALOG_DIR / ".staging"
+
+
+def _diy_ids_from_caps(capabilities):
+    ids = []
+    for cap in capabilities or []:
+        if isinstance(cap, dict) and cap.get("instance") == "diyScene":
+            ids.extend(
+                o.get("value")
+                for o in cap.get("parameters", {}).get("options", []) or []
+            )
+    return ids
+
+
+def _supports_scenes(capabilities):
+    return any(
+        isinstance(cap, dict) and cap.get("type", "").endswith("dynamic_scene")
+        for cap in capabilities or []
+    )
+
+
+class SceneSync:
+    TIMEOUT = 10.0      # seconds per cloud call
+
+    def __init__(self, api_key: str, catalog=scene_catalog):
+        self.api_key = api_key
+        self.catalog = catalog
+
+        self._lock = threading.Lock()
+        self._thread = None
+        self._status = self._idle_status()
+
+    # -------------------------
+    # Public API
+    # -------------------------
+
+    def start(self) -> bool:
+        """Start a sync in the background. False if one is already running."""
+        with self._lock:
+            if self._status["state"] == "running":
+                return False
+
+            self._status = self._idle_status()
+            self._status.update({"state": "running", "started": time.time()})
+
+            self._thread = threading.Thread(
+                target=self.run,
+                daemon=True
+            )
+            self._thread.start()
+
+        self._publish()
+        return True
+
+    def run(self):
+        """Synchronous sync (the worker thread body; also usable from a CLI)."""
+        start = time.monotonic()
+
+        with self._lock:
+            if self._status["state"] != "running":
+                self._status = self._idle_status()
+                self._status.update({"state": "running", "started": time.time()})
+
+        try:
+            devices = self._phase("devices", self._fetch_devices)
+            staged = self._phase("scenes", self._diff_devices, devices)
+            self._phase("swap", self._swap, staged)
+            state, error = "done", None
+        except Exception as e:
+            self._log(f"sync failed: {e}")
+            state, error = "error", str(e)
+
+        with self._lock:
+            self._status.update({
+                "state": state,
+                "phase": None,
+                "error": error,
+                "finished": time.time(),
+                "duration_ms": round((time.monotonic() - start) * 1000, 1),
+            })
+
+        self._publish()
+
+    def get_status(self) -> dict:
+        with self._lock:
+            status = dict(self._status)
+            status["progress"] = dict(status["progress"])
+            status["devices"] = dict(status["devices"])
+            status["timings"] = dict(status["timings"])
+            status["changed"] = list(status["changed"])
+            status["log"] = list(status["log"])
+            return status
+
+    # -------------------------
+    # Phases
+    # -------------------------
+
+    def _phase(self, name, fn, *args):
+        with self._lock:
+            self._status["phase"] = name
+        self._publish()
+
+        start = time.monotonic()
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._status["timings"][f"{name}_ms"] = round(
+                    (time.monotonic() - start) * 1000, 1
+                )
+
+    def _fetch_devices(self):
+        # SDK imported on first sync, not when the app starts
+        from govee.api.cloud import devices as cloud_devices
+
+        data = cloud_devices.get_devices(api_key=self.api_key, timeout=self.TIMEOUT)
+
+        if "data" in data:
+            devices = data.get("data", [])
+        else:
+            devices = data.get("payload", {}).get("devices", [])
+
+        devices = [d for d in devices if _supports_scenes(d.get("capabilities"))]
+
+        with self._lock:
+            self._status["devices"]["total"] = len(devices)
+            self._status["progress"] = {"done": 0, "total": len(devices)}
+
+        self._log(f"{len(devices)} scene-capable device(s)")
+        return devices
+
+    def _diff_devices(self, devices):
+        """Fetch DIY lists, compare with the catalog, stage changed devices."""
+        from govee.api.cloud import device_diy_scenes as cloud_diy_scenes
+
+        staged = []
+
+        for raw in devices:
+            device = {
+                "id": raw.get("device"),
+                "name": raw.get("deviceName", ""),
+                "sku": raw.get("sku"),
+            }
+            key = device_key(device["sku"], device["id"])
+
+            try:
+                scenes = cloud_diy_scenes.get_diy_scenes(
+                    api_key=self.api_key,
+                    device_id=device["id"],
+                    sku=device["sku"],
+                    timeout=self.TIMEOUT,
+                    device_name=device["name"],
+                )
+                diy_ids = _diy_ids_from_caps(raw.get("capabilities"))
+
+                if self._unchanged(key, device, scenes, diy_ids):
+                    self._count("unchanged")
+                else:
+                    path = write_catalog(
+                        device,
+                        [{**s, "sku": device["sku"]} for s in scenes],
+                        diy_scene_ids=diy_ids,
+                        directory=STAGING_DIR,
+                        previous=CATALOG_DIR / f"{key}.json",
+                    )
+                    staged.append(path)
+                    self._count("changed", key)
+                    self._log(f"{device['name']}: {len(scenes)} DIY scene(s) changed")
+
+            except Exception as e:
+                self._count("failed")
+                self._log(f"{device['name']}: {e}")
+
+            with self._lock:
+                self._status["progress"]["done"] += 1
+            self._publish()
+
+        return staged
+
+    def _swap(self, staged):
+        for path in staged:
+            path.replace(CATALOG_DIR / path.name)
+
+        try:
+            STAGING_DIR.rmdir()
+        except OSError:
+            pass
+
+        # One rebuild; readers keep the old index until it is replaced
+        self.catalog.invalidate()
+        self.catalog.index()
+
+        self._log(f"catalog swapped ({len(staged)} file(s))")
+
+    # -------------------------
+    # Internal
+    # -------------------------
+
+    def _unchanged(self, key, device, scenes, diy_ids):
+        try:
+            stored = json.loads((CATALOG_DIR / f"{key}.json").read_text())
+        except Exception:
+            return False
+
+        return (
+            stored.get("device", {}).get("name") == device["name"]
+            and sorted((s["id"], s["name"]) for s in stored.get("diy_scenes", []))
+            == sorted((s.get("id"), s.get("name")) for s in scenes)
+            and stored.get("diy_scene_ids", []) == sorted(set(diy_ids))
+        )
+
+    def _count(self, bucket, key=None):
+        with self._lock:
+            self._status["devices"][bucket] += 1
+            if key:
+                self._status["changed"].append(key)
+
+    def _log(self, msg):
+        print("Scene sync:", msg, flush=True)
+        with self._lock:
+            self._status["log"] = (self._status["log"] + [msg])[-LOG_LINES:]
+
+    def _publish(self):
+        status = self.get_status()
+        event_hub.publish("scene_sync", {
+            "state": status["state"],
+            "phase": status["phase"],
+            "progress": status["progress"],
+        })
+
+    @staticmethod
+    def _idle_status():
+        return {
+            "state": "idle",
+            "phase": None,
+            "progress": {"done": 0, "total": 0},
+            "devices": {"total": 0, "changed": 0, "unchanged": 0, "failed": 0},
+            "changed": [],
+            "timings": {},
+            "started": None,
+            "finished": None,
+            "duration_ms": None,
+            "error": None,
+            "log": [],
+        }
@@ -1,5 +1,23 @@
+"""
+Govee Cloud Status
+==================
+
+Pure helper module:
+- Stale-while-revalidate cache for the Open API device state
+- get_cloud_status() always returns the last known value immediately;
+  a stale value triggers ONE background refresh (single-flight), so
+  concurrent callers never each hit the cloud and never wait on it
+- Exposes the age of the cached data (get_stats())
+- Paces refreshes to a daily request budget (Govee counts requests per
+  API key per day): the refresh interval stretches when the remaining
+  budget for the day runs low, and stops when it is spent
+
+NO Flask code in here.
+"""
+
 import os
 import time
+import threading
 import requests
 from dotenv import load_dotenv
 
@@ -10,13 +28,15 @@ DEVICE = os.getenv("GOVEE_DEVICE_OPENAPI_ID")  # we’ll update this
 SKU = os.getenv("GOVEE_DEVICE_SKU")
 
 # IMPORTANT: override with the real cloud device ID
-if not DEVICE:
-    raise RuntimeError("GOVEE Open API Key Not Set.")
+# (without it the cache simply stays empty)
 
 URL = "https://openapi.api.govee.com/router/api/v1/device/state"
 
-_CACHE = {"ts": 0, "data": {}}
-CACHE_TTL = 10  # seconds
+CACHE_TTL = 10  # seconds before a value counts as stale
+TIMEOUT = 5     # seconds per cloud request
+
+# Share of the account's daily Open API allowance this cache may use
+DAILY_BUDGET = int(os.getenv("GOVEE_CLOUD_DAILY_BUDGET", "5000"))
 
 
 def _parse_capabilities(capabilities):
@@ -48,11 +68,7 @@ def _parse_capabilities(capabilities):
     return status
 
 
-def get_cloud_status(force=False):
-    now = time.time()
-    if not force and (now - _CACHE["ts"] < CACHE_TTL):
-        return _CACHE["data"]
-
+def _fetch():
     body = {
         "requestId": "status",
         "payload": {
@@ -66,15 +82,122 @@ def get_cloud_status(force=False):
         "Content-Type": "application/json",
     }
 
-    try:
-        res = requests.post(URL, json=body, headers=headers, timeout=5)
-        res.raise_for_status()
-        payload = res.json().get("payload", {})
-        caps = payload.get("capabilities", [])
-        parsed = _parse_capabilities(caps)
-    except Exception:
-        return _CACHE["data"]
-
-    _CACHE["ts"] = now
-    _CACHE["data"] = parsed
-    return parsed
+    res = requests.post(URL, json=body, headers=headers, timeout=TIMEOUT)
+    res.raise_for_status()
+    payload = res.json().get("payload", {})
+    return _parse_capabilities(payload.get("capabilities", []))
+
+
+class CloudStatusCache:
+    def __init__(self, fetch=_fetch, ttl: float = CACHE_TTL,
+                 daily_budget: int = DAILY_BUDGET):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.daily_budget = daily_budget
+
+        self._lock = threading.Lock()
+        self._data = {}
+        self._fetched = None       # wall time of the cached value
+        self._attempted = None     # monotonic time of the last request
+        self._refreshing = False
+
+        self._day = None
+        self._used = 0             # requests sent today (UTC)
+        self._stats = {"hits": 0, "refreshes": 0, "errors": 0, "skipped_budget": 0}
+        self._last_error = None
+
+    # -------------------------
+    # Public API
+    # -------------------------
+
+    def get(self, force: bool = False) -> dict:
+        """Last known status, immediately. Starts a refresh if stale."""
+        with self._lock:
+            self._stats["hits"] += 1
+            data = self._data
+
+            if self._refreshing:
+                return data
+            if (not force and self._attempted is not None
+                    and time.monotonic() - self._attempted < self._interval_locked()):
+                return data
+            if not self._take_budget_locked():
+                return data
+
+            self._refreshing = True
+            self._attempted = time.monotonic()
+
+        threading.Thread(target=self._refresh_worker, daemon=True).start()
+        return data
+
+    def age(self):
+        """Seconds since the cached value was fetched (None if never)."""
+        with self._lock:
+            return None if self._fetched is None else time.time() - self._fetched
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            interval = self._interval_locked()
+            return {
+                "age": None if self._fetched is None else round(time.time() - self._fetched, 1),
+                "fetched": self._fetched,
+                "refreshing": self._refreshing,
+                "interval": None if interval == float("inf") else round(interval, 1),
+                "budget": self.daily_budget,
+                "used_today": self._used,
+                "last_error": self._last_error,
+                **self._stats,
+            }
+
+    # -------------------------
+    # Internal
+    # -------------------------
+
+    def _refresh_worker(self):
+        try:
+            data = self.fetch()
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+                self._last_error = str(e)
+                self._refreshing = False
+            return
+
+        with self._lock:
+            self._data = data
+            self._fetched = time.time()
+            self._stats["refreshes"] += 1
+            self._last_error = None
+            self._refreshing = False
+
+    def _roll_day_locked(self):
+        day = time.gmtime().tm_yday
+        if day != self._day:
+            self._day = day
+            self._used = 0
+
+    def _interval_locked(self):
+        # Spread what is left of today's budget over what is left of the day
+        self._roll_day_locked()
+        remaining = self.daily_budget - self._used
+        if remaining <= 0:
+            return float("inf")
+        seconds_left = 86400 - (time.time() % 86400)
+        return max(self.ttl, seconds_left / remaining)
+
+    def _take_budget_locked(self):
+        self._roll_day_locked()
+        if self._used >= self.daily_budget:
+            self._stats["skipped_budget"] += 1
+            return False
+        self._used += 1
+        return True
+
+
+cache = CloudStatusCache()
+
+
+def get_cloud_status(force=False):
+    if not API_KEY or not DEVICE:
+        return {}
+    return cache.get(force=force)
@@ -4,23 +4,144 @@ import json
 import os
 from dotenv import load_dotenv
 import time
+import threading
 
 load_dotenv("envs/Govee_Keys.env")
 
 DEVICE_IP = os.getenv("GOVEE_DEVICE_LAN_ID")
-if not DEVICE_IP:
-    raise RuntimeError("GOVEE_DEVICE_LAN_ID not set")
 
-print("GOVEE LAN TARGET:", DEVICE_IP)
+# Missing config disables LAN control; it must not break importing
+if DEVICE_IP:
+    print("GOVEE LAN TARGET:", DEVICE_IP)
+else:
+    print("GOVEE_DEVICE_LAN_ID not set — LAN control disabled", flush=True)
 
 PORT = 4003
-TIMEOUT = 1.0
+STATUS_PORT = 4002          # devices answer devStatus here
+
+STATUS_INTERVAL = 5.0       # seconds between devStatus queries
+STATUS_MAX_AGE = 15.0       # older cached replies count as "no LAN data"
+
+# Commands per second per device (slider drags are coalesced down to this)
+MAX_SEND_RATE = float(os.getenv("GOVEE_LAN_MAX_RATE", "10"))
+
+
+# ==================================================
+# LAN sender (persistent socket + latest-wins queue)
+# ==================================================
+class LanSender:
+    """
+    One long-lived UDP socket and ONE sender thread.
+
+    Commands are queued per (device, cmd). A newer command of the same
+    type replaces the queued one (counted as coalesced), so a fast
+    brightness drag converges on the final value instead of replaying
+    every step. Each device is rate limited to max_rate sends/second.
+    """
+
+    def __init__(self, max_rate: float = MAX_SEND_RATE):
+        self.min_interval = 1.0 / max_rate if max_rate > 0 else 0.0
+
+        self._cond = threading.Condition()
+        self._pending = {}          # (ip, cmd) -> payload, oldest first
+        self._last_send = {}        # ip -> monotonic ts
+        self._stats = {"queued": 0, "sent": 0, "coalesced": 0, "dropped": 0}
+
+        self._sock = None
+        self._thread = None
+
+    def submit(self, payload: dict, ip: str = None):
+        ip = ip or DEVICE_IP
+        key = (ip, payload["msg"]["cmd"])
+
+        with self._cond:
+            self._stats["queued"] += 1
+            if self._pending.pop(key, None) is not None:
+                self._stats["coalesced"] += 1
+
+            # Re-insert at the end so commands keep user order
+            self._pending[key] = payload
+            self._ensure_thread()
+            self._cond.notify()
+
+    def get_stats(self) -> dict:
+        with self._cond:
+            return {
+                **self._stats,
+                "pending": len(self._pending),
+                "max_rate": round(1.0 / self.min_interval, 2) if self.min_interval else None,
+            }
+
+    def _ensure_thread(self):
+        # caller holds self._cond
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._send_worker,
+                daemon=True
+            )
+            self._thread.start()
+
+    def _next_ready(self):
+        """
+        Pop the oldest command whose device may send now.
+        Returns (key, payload, None), or (None, None, seconds_to_wait).
+        """
+        now = time.monotonic()
+        wait = None
+
+        for key in self._pending:
+            ready_at = self._last_send.get(key[0], 0) + self.min_interval
+            if ready_at <= now:
+                return key, self._pending.pop(key), None
+            wait = ready_at - now if wait is None else min(wait, ready_at - now)
+
+        return None, None, wait
+
+    def _send_worker(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+
+                key, payload, wait = self._next_ready()
+                if key is None:
+                    # Rate limited: sleep until a device is allowed again
+                    # (new submits wake us early and just coalesce)
+                    self._cond.wait(wait)
+                    continue
+
+                self._last_send[key[0]] = time.monotonic()
+
+            self._transmit(key[0], payload)
+
+    def _transmit(self, ip, payload):
+        try:
+            if self._sock is None:
+                self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._sock.sendto(json.dumps(payload).encode("utf-8"), (ip, PORT))
+        except OSError as e:
+            print("Govee LAN send failed:", e, flush=True)
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
+            with self._cond:
+                self._stats["dropped"] += 1
+            return
+
+        with self._cond:
+            self._stats["sent"] += 1
+
+
+_sender = LanSender()
 
 
 def _send(payload: dict):
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.sendto(json.dumps(payload).encode("utf-8"), (DEVICE_IP, PORT))
-    sock.close()
+    if not DEVICE_IP:
+        raise RuntimeError("GOVEE_DEVICE_LAN_ID not set")
+    _sender.submit(payload)
+
+
+def get_sender_stats() -> dict:
+    return _sender.get_stats()
 
 
 def power(on: bool):
@@ -63,35 +184,123 @@ def color_temp(kelvin: int):
         }
     })
 
+# ==================================================
+# LAN status listener (cached devStatus)
+# ==================================================
+class LanStatusListener:
+    """
+    Persistent socket on the Govee response port.
+
+    One thread sends devStatus every `interval` seconds and reads
+    replies as they arrive; the newest reply is cached with its
+    timestamp. Callers read the cache and never wait on the network.
+    """
+
+    def __init__(self, ip: str = None, interval: float = STATUS_INTERVAL):
+        self.ip = ip or DEVICE_IP
+        self.interval = interval
+
+        self._lock = threading.Lock()
+        self._data = None
+        self._ts = None
+        self._stats = {"queries": 0, "replies": 0, "errors": 0}
+
+        self._sock = None
+        self._port = None
+        self._thread = None
+
+    def start(self):
+        """Bind and start the listener thread (safe to call once)."""
+        if self._thread is not None:
+            return
+
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            self._sock.bind(("0.0.0.0", STATUS_PORT))
+        except OSError as e:
+            # Some firmware also replies to the source port
+            print(f"Govee LAN: port {STATUS_PORT} unavailable ({e}), using ephemeral port", flush=True)
+            self._sock.bind(("0.0.0.0", 0))
+        self._port = self._sock.getsockname()[1]
+
+        self._thread = threading.Thread(
+            target=self._listen_worker,
+            daemon=True
+        )
+        self._thread.start()
+
+    def get_status(self, max_age: float = STATUS_MAX_AGE):
+        """Cached devStatus data, or None if nothing fresh has arrived."""
+        with self._lock:
+            if self._ts is None or time.time() - self._ts > max_age:
+                return None
+            return dict(self._data)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "port": self._port,
+                "last_reply": self._ts,
+                "age": round(time.time() - self._ts, 1) if self._ts else None,
+            }
+
+    def _query(self):
+        try:
+            self._sock.sendto(
+                json.dumps({"msg": {"cmd": "devStatus", "data": {}}}).encode("utf-8"),
+                (self.ip, PORT)
+            )
+            with self._lock:
+                self._stats["queries"] += 1
+        except OSError as e:
+            print("Govee LAN status query failed:", e, flush=True)
+            with self._lock:
+                self._stats["errors"] += 1
+
+    def _handle(self, raw, addr):
+        try:
+            msg = json.loads(raw.decode("utf-8")).get("msg", {})
+        except (ValueError, AttributeError):
+            return
+
+        if msg.get("cmd") != "devStatus" or addr[0] != self.ip:
+            return
+
+        with self._lock:
+            self._data = msg.get("data", {}) or {}
+            self._ts = time.time()
+            self._stats["replies"] += 1
+
+    def _listen_worker(self):
+        next_query = 0.0
+
+        while True:
+            now = time.monotonic()
+            if now >= next_query:
+                self._query()
+                next_query = now + self.interval
+
+            try:
+                self._sock.settimeout(max(0.05, next_query - time.monotonic()))
+                raw, addr = self._sock.recvfrom(4096)
+            except socket.timeout:
+                continue
+            except OSError as e:
+                print("Govee LAN listener error:", e, flush=True)
+                time.sleep(self.interval)
+                continue
+
+            self._handle(raw, addr)
+
+
+status_listener = LanStatusListener()
+
+
 def query_status():
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.settimeout(TIMEOUT)
-
-    # Bind so the device can reply
-    sock.bind(("0.0.0.0", 0))
-
-    # Send devStatus query
-    sock.sendto(
-        json.dumps({
-            "msg": {"cmd": "devStatus"}
-        }).encode("utf-8"),
-        (DEVICE_IP, PORT)
-    )
-
-    try:
-        data, _ = sock.recvfrom(4096)
-        payload = json.loads(data.decode("utf-8"))
-    except socket.timeout:
-        return None
-    finally:
-        sock.close()
-
-    # Validate structure
-    msg = payload.get("msg", {})
-    if msg.get("cmd") != "devStatus":
-        return None
-
-    return msg.get("data", {})
+    """Latest cached devStatus data (no network wait), or None."""
+    return status_listener.get_status()
 
 def normalize_status(data: dict):
     if not data:
@@ -0,0 +1,163 @@
+"""
+Govee Worker
+============
+
+Pure helper module:
+- ONE asyncio event loop on ONE background thread for the process lifetime
+- ONE GoveeClient living on that loop
+- Flask handlers submit coroutines through a thread-safe future API
+  and wait with a timeout
+- Call / error / timeout counters and latency
+
+Replaces building a GoveeClient and running asyncio.run() per request,
+so the loop, its executor threads and the client stay warm.
+
+NO Flask code in here.
+"""
+
+import time
+import asyncio
+import threading
+import concurrent.futures
+
+
+class GoveeWorker:
+    DEFAULT_TIMEOUT = 15.0    # seconds a caller waits for a result
+
+    def __init__(self, api_key: str, prefer_lan: bool = True):
+        self.api_key = api_key
+        self.prefer_lan = prefer_lan
+
+        self.loop = None
+        self.client = None
+
+        self._ready = threading.Event()
+        self._running = False       # True only while the loop runs
+        self._error = None          # SDK import / client init failure
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stats = {
+            "calls": 0,
+            "errors": 0,
+            "timeouts": 0,
+            "last_ms": None,
+            "total_ms": 0.0,
+        }
+
+    # -------------------------
+    # Public API
+    # -------------------------
+
+    def start(self):
+        """
+        Start the loop thread and wait until the client exists and the loop
+        runs (safe to call once). Raises if the client could not be built.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._loop_worker,
+                daemon=True
+            )
+            self._thread.start()
+
+        self._ready.wait()
+        if self._error is not None:
+            raise RuntimeError(f"Govee worker failed to start: {self._error}") from self._error
+
+    def submit(self, fn, *args) -> concurrent.futures.Future:
+        """
+        Schedule fn(client, *args) — a coroutine function — on the loop.
+        Returns a concurrent.futures.Future (thread-safe).
+        """
+        if self._error is not None:
+            raise RuntimeError(f"Govee worker failed to start: {self._error}")
+        if not self._running:
+            raise RuntimeError("Govee worker not running")
+
+        return asyncio.run_coroutine_threadsafe(
+            self._timed(fn, *args),
+            self.loop,
+        )
+
+    def call(self, fn, *args, timeout: float = None):
+        """submit() and wait for the result (raises TimeoutError on timeout)."""
+        future = self.submit(fn, *args)
+
+        try:
+            return future.result(timeout or self.DEFAULT_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise TimeoutError("Govee call timed out")
+
+    def apply_scene(self, device, scene, timeout: float = None):
+        return self.call(
+            lambda client: client.apply_scene(device, scene),
+            timeout=timeout,
+        )
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            s = self._stats
+            return {
+                "running": self._running,
+                "error": str(self._error) if self._error is not None else None,
+                "calls": s["calls"],
+                "errors": s["errors"],
+                "timeouts": s["timeouts"],
+                "last_ms": s["last_ms"],
+                "avg_ms": round(s["total_ms"] / s["calls"], 1) if s["calls"] else None,
+            }
+
+    # -------------------------
+    # Internal
+    # -------------------------
+
+    async def _timed(self, fn, *args):
+        start = time.monotonic()
+        ok = False
+
+        try:
+            result = await fn(self.client, *args)
+            ok = True
+            return result
+        finally:
+            ms = (time.monotonic() - start) * 1000
+            with self._lock:
+                self._stats["calls"] += 1
+                self._stats["total_ms"] += ms
+                self._stats["last_ms"] = round(ms, 1)
+                if not ok:
+                    self._stats["errors"] += 1
+
+    def _loop_worker(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+        try:
+            # Heavy SDK import happens here, off the startup path
+            from govee import GoveeClient
+
+            self.client = GoveeClient(
+                api_key=self.api_key,
+                prefer_lan=self.prefer_lan,
+            )
+        except Exception as e:
+            # Fail start() / submit() fast instead of queuing onto a dead loop
+            print("Govee worker init failed:", e, flush=True)
+            self._error = e
+            self.loop.close()
+            self._ready.set()
+            return
+
+        # Ready only once the loop is actually running
+        self.loop.call_soon(self._loop_started)
+        try:
+            self.loop.run_forever()
+        finally:
+            self._running = False
+
+    def _loop_started(self):
+        self._running = True
+        self._ready.set()
@@ -0,0 +1,200 @@
+"""
+Hexa Glide State
+================
+
+Pure helper module:
+- Authoritative in-process Hexa Glide state, loaded ONCE at startup
+- Behaves like the old cfg["CURRENT_*"] keys, so scripts/govee_hexa.py
+  setters keep working unchanged
+- Tracks dirty writes and persists them from a background flusher
+  (debounced: a slider drag becomes one write, not dozens)
+- Flushes once more on shutdown
+
+Requests never touch data/hexa_state.json any more.
+
+NO Flask code in here.
+"""
+
+import json
+import time
+import atexit
+import threading
+from pathlib import Path
+from collections.abc import MutableMapping
+
+DEFAULTS = {
+    "CURRENT_POWER": False,
+    "CURRENT_BRIGHTNESS": 100,
+    "CURRENT_COLOR": {"r": 255, "g": 255, "b": 255},
+    "CURRENT_MODE": "color",
+    "CURRENT_SCENE": None,
+    "CURRENT_KELVIN": 6500,
+}
+
+
+class HexaState(MutableMapping):
+    FLUSH_DELAY = 2.0    # seconds of quiet before writing
+    MAX_DELAY = 10.0     # never hold a change longer than this
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+        self._cond = threading.Condition()
+        self._values = dict(DEFAULTS)
+
+        self._dirty_since = None     # first unsaved change
+        self._last_change = None     # most recent unsaved change
+        self._writes = 0
+        self._changes = 0
+        self._last_write = None
+
+        self._running = False
+        self._thread = None
+
+    # -------------------------
+    # Mapping interface (CURRENT_* keys)
+    # -------------------------
+
+    def __getitem__(self, key):
+        with self._cond:
+            return self._values[key]
+
+    def __setitem__(self, key, value):
+        with self._cond:
+            if key in self._values and self._values[key] == value:
+                return
+            self._values[key] = value
+            self._mark_dirty()
+
+    def __delitem__(self, key):
+        with self._cond:
+            del self._values[key]
+            self._mark_dirty()
+
+    def __iter__(self):
+        with self._cond:
+            return iter(list(self._values))
+
+    def __len__(self):
+        with self._cond:
+            return len(self._values)
+
+    # -------------------------
+    # Public API
+    # -------------------------
+
+    def load(self):
+        """Read data/hexa_state.json once (missing / broken file keeps defaults)."""
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print("Hexa state file ignored:", e, flush=True)
+            return
+
+        if not isinstance(data, dict):
+            return
+
+        with self._cond:
+            v = self._values
+            v["CURRENT_POWER"] = bool(data.get("power", v["CURRENT_POWER"]))
+            v["CURRENT_BRIGHTNESS"] = int(data.get("brightness", v["CURRENT_BRIGHTNESS"]))
+            v["CURRENT_COLOR"] = data.get("color") or v["CURRENT_COLOR"]
+            v["CURRENT_MODE"] = data.get("mode") or "color"
+            v["CURRENT_SCENE"] = data.get("active_scene")
+            v["CURRENT_KELVIN"] = int(data.get("kelvin", v["CURRENT_KELVIN"]))
+
+    def start(self):
+        """Start the write-behind flusher (safe to call once)."""
+        if self._running:
+            return
+
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._flush_worker,
+            daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def snapshot(self) -> dict:
+        """State in the on-disk / API shape."""
+        with self._cond:
+            v = self._values
+            return {
+                "power": bool(v["CURRENT_POWER"]),
+                "brightness": int(v["CURRENT_BRIGHTNESS"]),
+                "color": v["CURRENT_COLOR"],
+                "kelvin": int(v["CURRENT_KELVIN"]),
+                "mode": v["CURRENT_MODE"],
+                "active_scene": v["CURRENT_SCENE"],
+            }
+
+    def flush(self):
+        """Write now if anything changed since the last write."""
+        with self._cond:
+            if self._dirty_since is None:
+                return
+            payload = self.snapshot()
+            self._dirty_since = None
+            self._last_change = None
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(payload, indent=2))
+            tmp.replace(self.path)
+        except Exception as e:
+            print("Hexa state flush failed:", e, flush=True)
+            with self._cond:
+                self._mark_dirty()
+            return
+
+        with self._cond:
+            self._writes += 1
+            self._last_write = time.time()
+
+    def get_stats(self) -> dict:
+        with self._cond:
+            return {
+                "dirty": self._dirty_since is not None,
+                "changes": self._changes,
+                "writes": self._writes,
+                "last_write": self._last_write,
+            }
+
+    # -------------------------
+    # Internal
+    # -------------------------
+
+    def _mark_dirty(self):
+        # caller holds self._cond
+        now = time.monotonic()
+        if self._dirty_since is None:
+            self._dirty_since = now
+        self._last_change = now
+        self._changes += 1
+        self._cond.notify_all()
+
+    def _due_in(self):
+        # caller holds self._cond; seconds until the pending write is due
+        now = time.monotonic()
+        return min(
+            self._last_change + self.FLUSH_DELAY,
+            self._dirty_since + self.MAX_DELAY,
+        ) - now
+
+    def _flush_worker(self):
+        while self._running:
+            with self._cond:
+                self._cond.wait_for(lambda: self._dirty_since is not None)
+
+                # Debounce: keep waiting while changes keep arriving
+                while self._dirty_since is not None:
+                    delay = self._due_in()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+
+            self.flush()
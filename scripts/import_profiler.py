@@ -0,0 +1,120 @@
+"""
+Import Profiler
+===============
+
+Pure helper module:
+- Times every module import from the moment install() is called
+  (a sys.meta_path finder that wraps each loader's exec_module)
+- Records cumulative time (including nested imports) and self time
+  per module, plus the importing thread
+- get_report() feeds the /debug/imports endpoint, so cold-start cost
+  on the Pi can be measured without restarting under `-X importtime`
+
+Only the standard library is imported here; install() must run before
+the imports it should measure.
+
+NO Flask code in here.
+"""
+
+import sys
+import time
+import threading
+
+_lock = threading.Lock()
+_local = threading.local()      # per-thread stack of [name, child_seconds]
+_records = {}                   # module -> record dict
+_installed_at = None
+
+
+class _TimingFinder:
+    """Delegates to the real finders and times the loader they return."""
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        loader = spec.loader
+        # Class-level loaders (builtin / frozen) are shared; leave them alone
+        if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module"):
+            return spec
+
+        try:
+            loader.exec_module = _timed(name, loader.exec_module)
+        except AttributeError:
+            pass
+
+        return spec
+
+
+def _timed(name, exec_module):
+    def wrapper(module):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+
+        frame = [name, 0.0]
+        stack.append(frame)
+        start = time.perf_counter()
+
+        try:
+            return exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][1] += elapsed
+
+            with _lock:
+                _records[name] = {
+                    "module": name,
+                    "cumulative_ms": round(elapsed * 1000, 2),
+                    "self_ms": round((elapsed - frame[1]) * 1000, 2),
+                    "parent": stack[-1][0] if stack else None,
+                    "thread": threading.current_thread().name,
+                    "at_ms": round((time.perf_counter() - _installed_at) * 1000, 1),
+                }
+
+    return wrapper
+
+
+# ==================================================
+# Public API
+# ==================================================
+def install():
+    """Start recording imports (safe to call more than once)."""
+    global _installed_at
+
+    if any(isinstance(f, _TimingFinder) for f in sys.meta_path):
+        return
+
+    _installed_at = time.perf_counter()
+    sys.meta_path.insert(0, _TimingFinder())
+
+
+def get_report(limit: int = 50, prefix: str = None, sort: str = "cumulative") -> dict:
+    """
+    Slowest imports first. sort: "cumulative" | "self".
+    top_level sums only imports nobody else triggered (no double counting).
+    """
+    with _lock:
+        records = list(_records.values())
+
+    if prefix:
+        records = [r for r in records if r["module"].startswith(prefix)]
+
+    key = "self_ms" if sort == "self" else "cumulative_ms"
+    records.sort(key=lambda r: r[key], reverse=True)
+
+    return {
+        "installed": _installed_at is not None,
+        "modules": len(records),
+        "top_level_ms": round(sum(r["cumulative_ms"] for r in records if r["parent"] is None), 1),
+        "sort": key,
+        "imports": records[:limit],
+    }
@@ -0,0 +1,213 @@
+"""
+PC Bridge Client
+================
+
+Pure helper module:
+- One pooled, keep-alive requests.Session to the Windows PC listener
+- Single place for URL building and the SECRET_TOKEN handshake
+- Per-action timeouts
+- Latency / connect-time stats so tap-to-action cost is measurable
+
+Every route that talks to the PC goes through PCBridge instead of
+calling requests.get/post itself.
+
+NO Flask code in here.
+"""
+
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+
+
+class _TimedAdapter(HTTPAdapter):
+    """HTTPAdapter whose pool reports how long each new TCP connect takes."""
+
+    def __init__(self, on_connect, **kwargs):
+        self._on_connect = on_connect
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        on_connect = self._on_connect
+
+        class TimedConnection(HTTPConnection):
+            def connect(self):
+                start = time.monotonic()
+                super().connect()
+                on_connect((time.monotonic() - start) * 1000)
+
+        class TimedPool(HTTPConnectionPool):
+            ConnectionCls = TimedConnection
+
+        self.poolmanager.pool_classes_by_scheme = {
+            **self.poolmanager.pool_classes_by_scheme,
+            "http": TimedPool,
+        }
+
+
+class PCBridge:
+    DEFAULT_TIMEOUT = 3.0
+    POOL_SIZE = 4
+
+    # Per-action timeouts (seconds)
+    TIMEOUTS = {
+        "health": 1.5,
+        "open": 5.0,
+        "launch_steam": 5.0,
+        "launch_bambu": 3.0,
+        "download_file": 5.0,
+        "discord": 3.0,
+    }
+
+    def __init__(self, pc_ip: str, pc_port, token: str):
+        self.pc_ip = pc_ip
+        self.pc_port = pc_port
+        self.token = token
+
+        self._lock = threading.Lock()
+        self._stats = {}            # action -> counters
+        self._connects = 0
+        self._connect_ms_total = 0.0
+        self._connect_ms_last = None
+
+        self._session = requests.Session()
+        adapter = _TimedAdapter(
+            self._record_connect,
+            pool_connections=1,
+            pool_maxsize=self.POOL_SIZE,
+        )
+        self._session.mount("http://", adapter)
+
+    # -------------------------
+    # Public API
+    # -------------------------
+
+    @property
+    def configured(self):
+        return bool(self.pc_ip and self.pc_port)
+
+    def url(self, path: str) -> str:
+        return f"http://{self.pc_ip}:{self.pc_port}/{path.lstrip('/')}"
+
+    def get(self, path, params=None, action=None, auth=True, timeout=None):
+        """GET with the token sent as a query parameter."""
+        params = dict(params or {})
+        if auth:
+            params["token"] = self.token
+
+        return self._request("GET", path, action, timeout, params=params)
+
+    def post(self, path, json=None, params=None, action=None,
+             token_in="json", timeout=None):
+        """
+        POST to the PC.
+        token_in: "json" (body field) or "params" (query string),
+        matching what each PC listener endpoint expects.
+        """
+        json = dict(json or {})
+        params = dict(params or {})
+
+        if token_in == "params":
+            params["token"] = self.token
+        elif token_in == "json":
+            json["token"] = self.token
+
+        return self._request(
+            "POST", path, action, timeout,
+            params=params or None,
+            json=json,
+        )
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            actions = {
+                name: {
+                    "count": s["count"],
+                    "errors": s["errors"],
+                    "last_ms": s["last_ms"],
+                    "avg_ms": round(s["total_ms"] / s["count"], 1) if s["count"] else None,
+                    "max_ms": s["max_ms"],
+                    "server_ms": s["server_ms"],
+                }
+                for name, s in self._stats.items()
+            }
+
+            return {
+                "configured": self.configured,
+                "connections_opened": self._connects,
+                "connect_ms_last": self._connect_ms_last,
+                "connect_ms_avg": (
+                    round(self._connect_ms_total / self._connects, 1)
+                    if self._connects else None
+                ),
+                "actions": actions,
+            }
+
+    # -------------------------
+    # Internal
+    # -------------------------
+
+    def _timeout_for(self, action):
+        if action in self.TIMEOUTS:
+            return self.TIMEOUTS[action]
+
+        # "discord/join" -> "discord"
+        prefix = (action or "").split("/", 1)[0]
+        return self.TIMEOUTS.get(prefix, self.DEFAULT_TIMEOUT)
+
+    def _request(self, method, path, action, timeout, **kwargs):
+        if not self.configured:
+            raise RuntimeError("PC not configured")
+
+        action = action or path.strip("/")
+        timeout = timeout or self._timeout_for(action)
+        start = time.monotonic()
+
+        try:
+            res = self._session.request(
+                method,
+                self.url(path),
+                timeout=timeout,
+                **kwargs
+            )
+        except Exception:
+            self._record(action, (time.monotonic() - start) * 1000, None, ok=False)
+            raise
+
+        self._record(
+            action,
+            (time.monotonic() - start) * 1000,
+            res.elapsed.total_seconds() * 1000,
+            ok=res.ok,
+        )
+        return res
+
+    def _record(self, action, ms, server_ms, ok):
+        with self._lock:
+            s = self._stats.setdefault(action, {
+                "count": 0,
+                "errors": 0,
+                "total_ms": 0.0,
+                "last_ms": None,
+                "max_ms": 0.0,
+                "server_ms": None,
+            })
+
+            s["count"] += 1
+            s["total_ms"] += ms
+            s["last_ms"] = round(ms, 1)
+            s["max_ms"] = round(max(s["max_ms"], ms), 1)
+
+            if server_ms is not None:
+                s["server_ms"] = round(server_ms, 1)
+            if not ok:
+                s["errors"] += 1
+
+    def _record_connect(self, ms):
+        with self._lock:
+            self._connects += 1
+            self._connect_ms_total += ms
+            self._connect_ms_last = round(ms, 1)
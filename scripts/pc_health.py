@@ -0,0 +1,140 @@
+"""
+PC Health Monitor
+=================
+
+Pure helper module:
+- Probes the PC listener's /health endpoint from ONE background thread
+  (through the shared PCBridge session)
+- Keeps online/offline state in memory with hysteresis
+- Tracks last state change, round-trip time and probe counters
+- Pushes online/offline transitions to the event hub
+
+Routes read get_state(), which never touches the network.
+
+NO Flask code in here.
+"""
+
+import time
+import threading
+
+from scripts import event_hub
+from scripts.pc_bridge import PCBridge
+
+
+class PCHealthMonitor:
+    PROBE_TIMEOUT = 1.5       # seconds per /health request
+    INTERVAL_ONLINE = 3.0     # probe rate while the PC answers
+    INTERVAL_OFFLINE = 5.0    # slower while it is asleep
+    RISE = 1                  # consecutive successes to go online
+    FALL = 2                  # consecutive failures to go offline
+
+    def __init__(self, bridge: PCBridge):
+        self.bridge = bridge
+
+        self._lock = threading.Lock()
+
+        self._running = False
+        self._thread = None
+
+        self._online = False
+        self._since = None          # ts of last online/offline change
+        self._last_check = None
+        self._rtt_ms = None
+        self._successes = 0         # consecutive
+        self._failures = 0          # consecutive
+        self._probes = 0
+        self._errors = 0
+
+    # -------------------------
+    # Public API
+    # -------------------------
+
+    @property
+    def configured(self):
+        return self.bridge.configured
+
+    def start(self):
+        """Start the probe thread (safe to call once)."""
+        if self._running or not self.configured:
+            return
+
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._probe_worker,
+            daemon=True
+        )
+        self._thread.start()
+
+    def is_online(self) -> bool:
+        with self._lock:
+            return self._online
+
+    def get_state(self) -> dict:
+        """Cached health snapshot (no network)."""
+        with self._lock:
+            return {
+                "online": self._online,
+                "since": self._since,
+                "last_check": self._last_check,
+                "rtt_ms": self._rtt_ms,
+                "probes": self._probes,
+                "errors": self._errors,
+            }
+
+    # -------------------------
+    # Internal worker
+    # -------------------------
+
+    def _probe(self):
+        start = time.monotonic()
+
+        try:
+            res = self.bridge.get(
+                "health",
+                action="health",
+                auth=False,
+                timeout=self.PROBE_TIMEOUT,
+            )
+            ok = res.status_code == 200
+        except Exception:
+            ok = False
+
+        return ok, (time.monotonic() - start) * 1000
+
+    def _record(self, ok, rtt_ms):
+        changed = False
+
+        with self._lock:
+            self._probes += 1
+            self._last_check = time.time()
+
+            if ok:
+                self._rtt_ms = round(rtt_ms, 1)
+                self._successes += 1
+                self._failures = 0
+                if not self._online and self._successes >= self.RISE:
+                    changed = True
+            else:
+                self._errors += 1
+                self._failures += 1
+                self._successes = 0
+                if self._online and self._failures >= self.FALL:
+                    changed = True
+
+            if changed or self._since is None:
+                if changed:
+                    self._online = not self._online
+                self._since = self._last_check
+
+            pushed = {"online": self._online, "since": self._since}
+
+        event_hub.publish("pc_health", pushed)
+
+    def _probe_worker(self):
+        while self._running:
+            ok, rtt_ms = self._probe()
+            self._record(ok, rtt_ms)
+
+            time.sleep(
+                self.INTERVAL_ONLINE if self.is_online() else self.INTERVAL_OFFLINE
+            )
@@ -0,0 +1,104 @@
+"""
+Ring Buffer
+===========
+
+Fixed-size numeric ring backed by array.array.
+
+- Memory is allocated once (no per-sample objects / list growth)
+- append() overwrites the oldest value when full
+- tail(n) returns the newest n values in chronological order
+- Indexing is chronological too (0 = oldest), so bisect works on it
+
+Not thread-safe on its own — owners guard it with their own lock.
+"""
+
+import math
+from array import array
+
+
+class RingBuffer:
+    def __init__(self, capacity: int, typecode: str = "f"):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self.typecode = typecode
+        self._data = array(typecode, [0]) * capacity
+        self._head = 0      # next write position
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, value):
+        self._data[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("ring index out of range")
+        return self._data[(self._head - self._count + i) % self.capacity]
+
+    def latest(self, default=None):
+        if not self._count:
+            return default
+        return self._data[(self._head - 1) % self.capacity]
+
+    def tail(self, n: int = None) -> list:
+        """Newest n values (all if None), oldest first."""
+        n = self._count if n is None else max(0, min(n, self._count))
+        if not n:
+            return []
+
+        start = (self._head - n) % self.capacity
+        if start + n <= self.capacity:
+            return self._data[start:start + n].tolist()
+
+        return (
+            self._data[start:].tolist()
+            + self._data[:(start + n) - self.capacity].tolist()
+        )
+
+    def slice(self, start: int, stop: int) -> list:
+        """Chronological values [start, stop) without copying the whole ring."""
+        start = max(0, start)
+        stop = min(stop, self._count)
+        if stop <= start:
+            return []
+
+        first = (self._head - self._count + start) % self.capacity
+        n = stop - start
+        if first + n <= self.capacity:
+            return self._data[first:first + n].tolist()
+
+        return (
+            self._data[first:].tolist()
+            + self._data[:(first + n) - self.capacity].tolist()
+        )
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+    def to_bytes(self) -> bytes:
+        """Chronological contents as raw machine values (for snapshots)."""
+        return array(self.typecode, self.tail()).tobytes()
+
+    def load_bytes(self, raw: bytes):
+        """Replace contents with values produced by to_bytes()."""
+        values = array(self.typecode)
+        values.frombytes(raw)
+        self.clear()
+        for value in values[-self.capacity:]:
+            self.append(value)
+
+
+def clean(value, digits=1):
+    """Round for JSON; NaN (missing sample) becomes None."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return round(value, digits)
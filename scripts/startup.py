@@ -0,0 +1,139 @@
+"""
+Startup Orchestrator
+====================
+
+Pure helper module:
+- Times every startup step and keeps its state
+  (pending -> running -> ready / failed, or disabled)
+- Core steps run inline (`with startup.step(...)`); the app is served
+  as soon as they are done
+- Independent integrations run concurrently on their own threads
+  (spawn()), optionally waiting for a readiness check after the start
+  call returns (MQTT handshake, Discord login, ...)
+- A step whose readiness check times out is "failed", but the check
+  keeps running (every LATE_POLL_INTERVAL); a late success turns the
+  step "ready", so /health/ready recovers without a restart
+- get_status() feeds /health/ready
+
+NO Flask code in here.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+
+
+class Startup:
+    POLL_INTERVAL = 0.25        # seconds between readiness checks
+    LATE_POLL_INTERVAL = 5.0    # ... after the step timed out
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._t0 = time.monotonic()
+        self._steps = {}    # name -> step dict (insertion = start order)
+
+    # -------------------------
+    # Public API
+    # -------------------------
+
+    @contextmanager
+    def step(self, name: str):
+        """Time an inline core step. Exceptions propagate (core must work)."""
+        self._begin(name, core=True)
+        try:
+            yield
+        except BaseException as e:
+            self._finish(name, "failed", str(e))
+            raise
+        self._finish(name, "ready")
+
+    def spawn(self, name: str, fn, *args, ready=None, timeout: float = None):
+        """
+        Run fn(*args) on a background thread. If `ready` is given, the step
+        stays "running" until ready() is truthy (or `timeout` seconds pass).
+        """
+        self._begin(name, core=False)
+
+        threading.Thread(
+            target=self._run,
+            args=(name, fn, args, ready, timeout),
+            daemon=True
+        ).start()
+
+    def skip(self, name: str, reason: str):
+        """Record a subsystem that is intentionally not started."""
+        with self._lock:
+            self._steps[name] = {
+                "state": "disabled",
+                "core": False,
+                "started_ms": None,
+                "ms": None,
+                "error": reason,
+            }
+
+    def get_status(self) -> dict:
+        with self._lock:
+            steps = {name: dict(s) for name, s in self._steps.items()}
+
+        now = time.monotonic()
+        for s in steps.values():
+            if s["state"] == "running":
+                s["ms"] = round((now - self._t0) * 1000 - s["started_ms"], 1)
+
+        return {
+            "ready": all(s["state"] == "ready" for s in steps.values() if s["core"]),
+            "complete": not any(s["state"] in ("pending", "running") for s in steps.values()),
+            "failed": [name for name, s in steps.items() if s["state"] == "failed"],
+            "uptime_ms": round((now - self._t0) * 1000, 1),
+            "steps": steps,
+        }
+
+    # -------------------------
+    # Internal
+    # -------------------------
+
+    def _begin(self, name, core):
+        with self._lock:
+            self._steps[name] = {
+                "state": "running",
+                "core": core,
+                "started_ms": round((time.monotonic() - self._t0) * 1000, 1),
+                "ms": None,
+                "error": None,
+            }
+
+    def _finish(self, name, state, error=None):
+        with self._lock:
+            s = self._steps[name]
+            s["state"] = state
+            s["error"] = error
+            s["ms"] = round((time.monotonic() - self._t0) * 1000 - s["started_ms"], 1)
+
+        print(f"Startup: {name} {state} ({s['ms']} ms)" + (f": {error}" if error else ""), flush=True)
+
+    def _run(self, name, fn, args, ready, timeout):
+        try:
+            fn(*args)
+        except Exception as e:
+            self._finish(name, "failed", str(e))
+            return
+
+        if ready is not None:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            interval = self.POLL_INTERVAL
+
+            while not self._check(name, ready):
+                if interval == self.POLL_INTERVAL and deadline is not None and time.monotonic() > deadline:
+                    # Report the timeout, but keep watching for a late success
+                    self._finish(name, "failed", f"not ready after {timeout}s")
+                    interval = self.LATE_POLL_INTERVAL
+                time.sleep(interval)
+
+        self._finish(name, "ready")
+
+    def _check(self, name, ready):
+        try:
+            return ready()
+        except Exception as e:
+            print(f"Startup: {name} readiness check failed:", e, flush=True)
+            return False
@@ -1,6 +1,6 @@
 import os
+import threading
 from dotenv import load_dotenv
-from steam.webapi import WebAPI
 from pathlib import Path
 from datetime import datetime
 
@@ -14,20 +14,35 @@ load_dotenv(BASE_DIR / "envs" / "steam.env")
 STEAM_ID = os.getenv("STEAM_ID")
 STEAM_KEY = os.getenv("STEAM_KEY")
 
-if not STEAM_ID:
-    raise RuntimeError("STEAM_ID not found")
+# WebAPI() downloads the interface list, so build it on first use
+# (or from the startup orchestrator) instead of at import
+_api = None
+_api_lock = threading.Lock()
 
-if not STEAM_KEY:
-    raise RuntimeError("STEAM_KEY not found")
+def is_configured():
+    return bool(STEAM_ID and STEAM_KEY)
 
-steamApi = WebAPI(STEAM_KEY)
+def get_api():
+    global _api
+
+    # Missing keys fail the Steam calls, not the whole app
+    if not STEAM_ID:
+        raise RuntimeError("STEAM_ID not found")
+    if not STEAM_KEY:
+        raise RuntimeError("STEAM_KEY not found")
+
+    with _api_lock:
+        if _api is None:
+            from steam.webapi import WebAPI
+            _api = WebAPI(STEAM_KEY)
+        return _api
 
 # ============================================================
 # Profile / Status
 # ============================================================
 
 def get_last_online():
-    profile = steamApi.ISteamUser.GetPlayerSummaries(steamids=STEAM_ID)
+    profile = get_api().ISteamUser.GetPlayerSummaries(steamids=STEAM_ID)
     players = profile["response"].get("players", [])
 
     if not players:
@@ -83,7 +98,7 @@ def get_last_online():
 # ============================================================
 
 def get_recent_games(limit=4):
-    recent = steamApi.call(
+    recent = get_api().call(
         "IPlayerService.GetRecentlyPlayedGames",
         steamid=STEAM_ID,
         count=limit
@@ -101,7 +116,7 @@ def get_recent_games(limit=4):
 
 
 def get_top_games(limit=4):
-    owned = steamApi.call(
+    owned = get_api().call(
         "IPlayerService.GetOwnedGames",
         steamid=STEAM_ID,
         appids_filter=[],
@@ -129,7 +144,7 @@ def get_top_games(limit=4):
 # ============================================================
 
 def get_friends_status(limit=None):
-    friends_data = steamApi.ISteamUser.GetFriendList(
+    friends_data = get_api().ISteamUser.GetFriendList(
         steamid=STEAM_ID,
         relationship="friend"
     )
@@ -142,7 +157,7 @@ def get_friends_status(limit=None):
     if limit:
         steam_ids = steam_ids[:limit]
 
-    summaries = steamApi.ISteamUser.GetPlayerSummaries(
+    summaries = get_api().ISteamUser.GetPlayerSummaries(
         steamids=",".join(steam_ids)
     )
 
@@ -1,7 +1,7 @@
 import json
 from pathlib import Path
 
-from scripts.steam_api import steamApi, STEAM_ID
+from scripts.steam_api import get_api, STEAM_ID
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
@@ -61,7 +61,7 @@ def save_pinned_friends(data):
 # ==============
 
 def get_owned_games():
-    owned = steamApi.call(
+    owned = get_api().call(
         "IPlayerService.GetOwnedGames",
         steamid=STEAM_ID,
         appids_filter=[],
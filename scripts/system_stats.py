@@ -0,0 +1,179 @@
+"""
+System Stats Sampler
+====================
+
+Pure helper module:
+- Samples CPU (overall + per core), RAM, disk, load average and
+  temperature from ONE background thread at a fixed rate
+- Keeps the last N samples in array-backed ring buffers
+- Routes read latest() / history(), which never sleep
+- Hands every sample to registered listeners (e.g. the trend store)
+
+psutil.cpu_percent(interval=None) measures since the previous call,
+so sampling on a fixed tick gives accurate CPU numbers without the
+old 0.5s blocking read per request.
+
+NO Flask code in here.
+"""
+
+import os
+import math
+import time
+import threading
+import psutil
+
+from scripts.ring_buffer import RingBuffer, clean
+
+SERIES = ("cpu", "ram", "disk", "load", "temp")
+
+# Preferred sensor names (Pi first)
+TEMP_SENSORS = ("cpu_thermal", "soc_thermal", "coretemp", "k10temp")
+
+
+def read_temperature():
+    """CPU temperature in °C, or None if the platform has no sensor."""
+    try:
+        temps = psutil.sensors_temperatures()
+    except Exception:
+        return None
+
+    for name in TEMP_SENSORS:
+        if temps.get(name):
+            return temps[name][0].current
+
+    for entries in temps.values():
+        if entries:
+            return entries[0].current
+
+    return None
+
+
+class SystemStatsSampler:
+    INTERVAL = 1.0       # seconds between samples
+    CAPACITY = 600       # 10 minutes at 1 Hz
+
+    def __init__(self, interval: float = INTERVAL, capacity: int = CAPACITY):
+        self.interval = interval
+        self.capacity = capacity
+        self.cores = psutil.cpu_count() or 1
+
+        self._lock = threading.Lock()
+        self._ts = RingBuffer(capacity, "d")
+        self._series = {name: RingBuffer(capacity) for name in SERIES}
+        self._per_core = [RingBuffer(capacity) for _ in range(self.cores)]
+        self._latest = None
+        self._listeners = []
+
+        self._running = False
+        self._thread = None
+
+    # -------------------------
+    # Public API
+    # -------------------------
+
+    def start(self):
+        """Start the sampler thread (safe to call once)."""
+        if self._running:
+            return
+
+        self._running = True
+
+        # Prime cpu_percent so the first real sample has a baseline
+        psutil.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None, percpu=True)
+
+        self._thread = threading.Thread(
+            target=self._sample_worker,
+            daemon=True
+        )
+        self._thread.start()
+
+    def add_listener(self, fn):
+        """Call fn(sample) after every sample (from the sampler thread)."""
+        self._listeners.append(fn)
+
+    def latest(self):
+        """Most recent sample (instant), or None until the thread has taken one."""
+        with self._lock:
+            return dict(self._latest) if self._latest is not None else None
+
+    def history(self, window: float = 60) -> dict:
+        """Buffered series covering the last `window` seconds, oldest first."""
+        n = max(1, min(self.capacity, math.ceil(window / self.interval)))
+
+        with self._lock:
+            return {
+                "interval": self.interval,
+                "ts": self._ts.tail(n),
+                **{
+                    name: [clean(v) for v in ring.tail(n)]
+                    for name, ring in self._series.items()
+                },
+                "cpu_per_core": [
+                    [clean(v) for v in ring.tail(n)]
+                    for ring in self._per_core
+                ],
+            }
+
+    # -------------------------
+    # Internal worker
+    # -------------------------
+
+    def _sample(self) -> dict:
+        try:
+            load = os.getloadavg()[0]
+        except (AttributeError, OSError):
+            load = None
+
+        temp = read_temperature()
+
+        return {
+            "ts": time.time(),
+            "cpu": psutil.cpu_percent(interval=None),
+            "cpu_per_core": psutil.cpu_percent(interval=None, percpu=True),
+            "ram": psutil.virtual_memory().percent,
+            "disk": psutil.disk_usage("/").percent,
+            "load": round(load, 2) if load is not None else None,
+            "temp": round(temp, 1) if temp is not None else None,
+        }
+
+    def _record(self, sample):
+        with self._lock:
+            self._ts.append(sample["ts"])
+
+            for name, ring in self._series.items():
+                value = sample.get(name)
+                ring.append(math.nan if value is None else value)
+
+            per_core = sample.get("cpu_per_core") or []
+            for i, ring in enumerate(self._per_core):
+                ring.append(per_core[i] if i < len(per_core) else math.nan)
+
+            self._latest = sample
+
+    def _sample_worker(self):
+        next_tick = time.monotonic()
+
+        while self._running:
+            try:
+                sample = self._sample()
+                self._record(sample)
+            except Exception as e:
+                print("System stats sample failed:", e, flush=True)
+                sample = None
+
+            if sample is not None:
+                for fn in self._listeners:
+                    try:
+                        fn(sample)
+                    except Exception as e:
+                        print("System stats listener failed:", e, flush=True)
+
+            next_tick += self.interval
+            delay = next_tick - time.monotonic()
+
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind (Pi under load) — don't burst to catch up
+                next_tick = time.monotonic()
@@ -0,0 +1,324 @@
+"""
+Time-Series Store
+=================
+
+Pure helper module:
+- Keeps raw 1s samples for a short window
+- Rolls them up into 1-minute and 1-hour min/avg/max buckets as they arrive
+- Every tier is a fixed-size array-backed ring (memory never grows)
+- Snapshots the rollup tiers to disk periodically (atomic write)
+- Range queries pick ONE tier and binary-search its timestamps,
+  so a 90 day query never touches raw samples
+
+Tiers (name, seconds per point, points kept):
+    1s   1      900     (15 minutes)
+    1m   60     10080   (1 week)
+    1h   3600   2160    (90 days)
+
+NO Flask code in here.
+"""
+
+import json
+import math
+import time
+import base64
+import atexit
+import bisect
+import threading
+from pathlib import Path
+
+from scripts.ring_buffer import RingBuffer, clean
+
+TIERS = (
+    ("1s", 1, 15 * 60),
+    ("1m", 60, 7 * 24 * 60),
+    ("1h", 3600, 90 * 24),
+)
+
+MAX_POINTS = 720            # auto tier choice keeps responses chart-sized
+SNAPSHOT_INTERVAL = 300     # seconds between disk snapshots
+SNAPSHOT_VERSION = 1
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii")
+
+
+class _Tier:
+    """One resolution: timestamps + per-metric min/avg/max rings."""
+
+    def __init__(self, name, resolution, capacity, metrics):
+        self.name = name
+        self.resolution = resolution
+        self.capacity = capacity
+        # Raw samples have min == avg == max, so only avg is stored
+        self.rollup = resolution > 1
+        self.fields = ("min", "avg", "max") if self.rollup else ("avg",)
+
+        self.ts = RingBuffer(capacity, "d")
+        self.series = {
+            metric: {field: RingBuffer(capacity) for field in self.fields}
+            for metric in metrics
+        }
+
+    @property
+    def span(self):
+        return self.resolution * self.capacity
+
+    def append(self, ts, stats):
+        """stats: metric -> (min, avg, max)"""
+        self.ts.append(ts)
+        for metric, rings in self.series.items():
+            lo, avg, hi = stats.get(metric, (math.nan,) * 3)
+            rings["avg"].append(avg)
+            if self.rollup:
+                rings["min"].append(lo)
+                rings["max"].append(hi)
+
+    def query(self, start, end, metrics):
+        # Include the bucket that contains `start`
+        lo = bisect.bisect_left(self.ts, start - (start % self.resolution))
+        hi = bisect.bisect_right(self.ts, end)
+
+        return {
+            "resolution": self.name,
+            "step": self.resolution,
+            "ts": self.ts.slice(lo, hi),
+            "series": {
+                metric: {
+                    field: [clean(v) for v in ring.slice(lo, hi)]
+                    for field, ring in self.series[metric].items()
+                }
+                for metric in metrics
+            },
+        }
+
+    def dump(self):
+        return {
+            "ts": _b64(self.ts.to_bytes()),
+            "series": {
+                metric: {field: _b64(ring.to_bytes()) for field, ring in rings.items()}
+                for metric, rings in self.series.items()
+            },
+        }
+
+    def load(self, payload):
+        self.ts.load_bytes(base64.b64decode(payload["ts"]))
+        for metric, rings in self.series.items():
+            saved = payload["series"].get(metric, {})
+            for field, ring in rings.items():
+                if field in saved:
+                    ring.load_bytes(base64.b64decode(saved[field]))
+                else:
+                    ring.clear()
+
+            # A metric added since the snapshot: pad so indexes line up
+            for ring in rings.values():
+                while len(ring) < len(self.ts):
+                    ring.append(math.nan)
+
+
+class TimeSeriesStore:
+    def __init__(self, metrics, path: Path = None, tiers=TIERS):
+        self.metrics = tuple(metrics)
+        self.path = Path(path) if path else None
+
+        self._lock = threading.Lock()
+        self._tiers = [_Tier(name, res, cap, self.metrics) for name, res, cap in tiers]
+
+        # Open bucket per rollup tier (index matches self._tiers)
+        # {"start": ts, "stats": {metric: [min, sum, max, count]}}
+        self._pending = [None] * len(self._tiers)
+
+        self._dirty = False
+        self._last_snapshot = None
+        self._running = False
+        self._thread = None
+
+        self._load()
+
+    # -------------------------
+    # Public API
+    # -------------------------
+
+    def start(self):
+        """Start the snapshot thread and flush once more at exit."""
+        if self._running or self.path is None:
+            return
+
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._snapshot_worker,
+            daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.save)
+
+    def add(self, sample: dict):
+        """Feed one raw sample (needs "ts"; missing metrics are gaps)."""
+        ts = sample["ts"]
+        values = {}
+        for metric in self.metrics:
+            value = sample.get(metric)
+            values[metric] = math.nan if value is None else float(value)
+
+        with self._lock:
+            self._tiers[0].append(ts, {m: (v, v, v) for m, v in values.items()})
+            self._roll(1, ts, {
+                m: [v, v, v, 1] if not math.isnan(v) else [math.inf, 0.0, -math.inf, 0]
+                for m, v in values.items()
+            })
+            self._dirty = True
+
+    def range(self, start: float, end: float = None, metrics=None, resolution: str = None) -> dict:
+        """
+        Points between start and end (unix seconds) from a single tier.
+        resolution: "1s" / "1m" / "1h", or None to pick the finest tier
+        that covers the range within MAX_POINTS.
+        """
+        end = time.time() if end is None else end
+        metrics = [m for m in (metrics or self.metrics) if m in self.metrics]
+
+        with self._lock:
+            tier = self._pick_tier(start, end, resolution)
+            result = tier.query(start, end, metrics)
+
+        result.update({"start": start, "end": end})
+        return result
+
+    def get_tiers(self) -> dict:
+        with self._lock:
+            return {
+                "metrics": list(self.metrics),
+                "last_snapshot": self._last_snapshot,
+                "tiers": [
+                    {
+                        "name": t.name,
+                        "step": t.resolution,
+                        "capacity": t.capacity,
+                        "points": len(t.ts),
+                        "oldest": t.ts[0] if len(t.ts) else None,
+                        "newest": t.ts.latest(),
+                    }
+                    for t in self._tiers
+                ],
+            }
+
+    def save(self):
+        """Atomically write the rollup tiers (raw samples are not persisted)."""
+        if self.path is None:
+            return
+
+        with self._lock:
+            if not self._dirty:
+                return
+
+            payload = {
+                "version": SNAPSHOT_VERSION,
+                "saved": time.time(),
+                "metrics": list(self.metrics),
+                "tiers": {t.name: t.dump() for t in self._tiers if t.rollup},
+                "pending": {
+                    t.name: {
+                        "start": self._pending[i]["start"],
+                        "stats": {m: list(acc) for m, acc in self._pending[i]["stats"].items()},
+                    }
+                    for i, t in enumerate(self._tiers)
+                    if t.rollup and self._pending[i] is not None
+                },
+            }
+            self._dirty = False
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(payload, separators=(",", ":")))
+            tmp.replace(self.path)
+            self._last_snapshot = payload["saved"]
+        except Exception as e:
+            print("Time-series snapshot failed:", e, flush=True)
+            with self._lock:
+                self._dirty = True
+
+    # -------------------------
+    # Internal
+    # -------------------------
+
+    def _roll(self, level, ts, stats):
+        """Merge stats into the open bucket of tier `level`, closing it on rollover."""
+        if level >= len(self._tiers):
+            return
+
+        tier = self._tiers[level]
+        bucket_start = ts - (ts % tier.resolution)
+        pending = self._pending[level]
+
+        if pending is not None and pending["start"] != bucket_start:
+            closed = pending["stats"]
+            tier.append(pending["start"], {
+                m: (lo, total / n, hi) if n else (math.nan,) * 3
+                for m, (lo, total, hi, n) in closed.items()
+            })
+            self._roll(level + 1, pending["start"], closed)
+            pending = None
+
+        if pending is None:
+            pending = {
+                "start": bucket_start,
+                "stats": {m: [math.inf, 0.0, -math.inf, 0] for m in self.metrics},
+            }
+            self._pending[level] = pending
+
+        for metric, (lo, total, hi, n) in stats.items():
+            if not n:
+                continue
+            acc = pending["stats"][metric]
+            acc[0] = min(acc[0], lo)
+            acc[1] += total
+            acc[2] = max(acc[2], hi)
+            acc[3] += n
+
+    def _pick_tier(self, start, end, resolution):
+        if resolution:
+            for tier in self._tiers:
+                if tier.name == resolution:
+                    return tier
+            raise ValueError(f"unknown resolution '{resolution}'")
+
+        age = time.time() - start
+        for tier in self._tiers:
+            if tier.span >= age and (end - start) / tier.resolution <= MAX_POINTS:
+                return tier
+
+        return self._tiers[-1]
+
+    def _load(self):
+        if self.path is None or not self.path.exists():
+            return
+
+        try:
+            payload = json.loads(self.path.read_text())
+            if payload.get("version") != SNAPSHOT_VERSION:
+                return
+
+            for i, tier in enumerate(self._tiers):
+                if tier.name in payload["tiers"]:
+                    tier.load(payload["tiers"][tier.name])
+
+                pending = payload.get("pending", {}).get(tier.name)
+                if pending is not None:
+                    saved = pending["stats"]
+                    pending["stats"] = {
+                        m: saved.get(m, [math.inf, 0.0, -math.inf, 0])
+                        for m in self.metrics
+                    }
+                    self._pending[i] = pending
+
+            self._last_snapshot = payload.get("saved")
+        except Exception as e:
+            print("Time-series snapshot ignored:", e, flush=True)
+
+    def _snapshot_worker(self):
+        while self._running:
+            time.sleep(SNAPSHOT_INTERVAL)
+            self.save()
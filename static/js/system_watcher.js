@@ -1,12 +1,23 @@
 let lastLightPower = undefined;   // undefined = not initialized yet
 let watcherStarted = false;
 
-async function pollSystemState() {
+async function fetchJSON(url) {
     try {
-        const res = await fetch("/api/hexa/status", { cache: "no-store" });
-        if (!res.ok) return;
+        const res = await fetch(url, { cache: "no-store" });
+        if (!res.ok) return null;
+        return await res.json();
+    } catch {
+        return null;
+    }
+}
 
-        const data = await res.json();
+async function pollSystemState() {
+    const data = await fetchJSON("/api/hexa/status");
+    if (data) handleLightsState(data);
+}
+
+function handleLightsState(data) {
+    try {
         const power = data.power === "on";
 
         // First run: initialize state only, no notification
@@ -34,11 +45,12 @@ async function pollSystemState() {
 let lastDiscordState = undefined;
 
 async function pollDiscordVoice() {
-    try {
-        const res = await fetch("/api/discord/voice", { cache: "no-store" });
-        if (!res.ok) return;
+    const data = await fetchJSON("/api/discord/voice");
+    if (data) handleDiscordVoice(data);
+}
 
-        const data = await res.json();
+function handleDiscordVoice(data) {
+    try {
 
         /*
           Normalize to:
@@ -169,11 +181,12 @@ async function pollDiscordVoice() {
 let lastBambuState = undefined;
 
 async function pollBambuState() {
-    try {
-        const res = await fetch("/api/p1s/status", { cache: "no-store" });
-        if (!res.ok) return;
+    const data = await fetchJSON("/api/p1s/status");
+    if (data) handleBambuState(data);
+}
 
-        const data = await res.json();
+function handleBambuState(data) {
+    try {
         const state = data.state; // e.g. "Printing", "Complete"
 
         // First run: initialize only
@@ -245,11 +258,12 @@ async function loadPinnedSteamFriends() {
 let lastSteamState = undefined;
 
 async function pollSteamFriends() {
-    try {
-        const res = await fetch("/api/steam/friends", { cache: "no-store" });
-        if (!res.ok) return;
+    const friends = await fetchJSON("/api/steam/friends");
+    if (friends) handleSteamFriends(friends);
+}
 
-        const friends = await res.json();
+function handleSteamFriends(friends) {
+    try {
 
         /*
           Normalize to:
@@ -350,19 +364,88 @@ async function pollSteamFriends() {
     }
 }
 
+/* ================= Event stream (/api/events) =================
+
+   One EventSource per tab replaces the per-endpoint polling below.
+   Every event is also re-dispatched on window as "cc:<topic>" so
+   page scripts can listen without caring about load order:
+
+       window.addEventListener("cc:pc_health", e => render(e.detail));
+
+   window.ccEventsLive is true while the stream is connected; page
+   polling loops check it and only fetch when the stream is down.
+*/
+
+const EVENT_HANDLERS = {
+    lights: handleLightsState,
+    printer: handleBambuState,
+    discord_voice: handleDiscordVoice,
+    discord_text: null,
+    steam_friends: handleSteamFriends,
+    pc_health: null,
+};
+
+let eventSource = null;
+window.ccEventsLive = false;
+
+function routeStreamEvent(topic, raw) {
+    let data;
+    try {
+        data = JSON.parse(raw);
+    } catch {
+        return;
+    }
+
+    const handler = EVENT_HANDLERS[topic];
+    if (handler) handler(data);
+
+    window.dispatchEvent(new CustomEvent(`cc:${topic}`, { detail: data }));
+}
+
+function startEventStream() {
+    if (!window.EventSource) return;
+
+    eventSource = new EventSource("/api/events");
+
+    eventSource.onopen = () => {
+        window.ccEventsLive = true;
+    };
+
+    eventSource.onerror = () => {
+        window.ccEventsLive = false;
+
+        // Browser retries on its own unless the stream was refused outright
+        if (eventSource.readyState === EventSource.CLOSED) {
+            eventSource = null;
+            setTimeout(startEventStream, 10000);
+        }
+    };
+
+    for (const topic of Object.keys(EVENT_HANDLERS)) {
+        eventSource.addEventListener(topic, e => routeStreamEvent(topic, e.data));
+    }
+}
+
+/* Polling fallback — only runs while the event stream is down */
+function whenOffline(fn) {
+    return () => {
+        if (!window.ccEventsLive) fn();
+    };
+}
+
 function startSystemWatcher() {
     if (watcherStarted) return;
     watcherStarted = true;
 
     setTimeout(async () => {
-        pollSystemState();
-
         await loadPinnedSteamFriends();
 
-        setInterval(pollSystemState, 2000);
-        setInterval(pollDiscordVoice, 2000);
-        setInterval(pollSteamFriends, 5000);
-        setInterval(pollBambuState, 5000);
+        startEventStream();
+
+        setInterval(whenOffline(pollSystemState), 2000);
+        setInterval(whenOffline(pollDiscordVoice), 2000);
+        setInterval(whenOffline(pollSteamFriends), 5000);
+        setInterval(whenOffline(pollBambuState), 5000);
     }, 800);
 }
 